@@ -1,14 +1,12 @@
 """MDF Agent — Intelligent Substitution Copilot."""
 
+import importlib
+import threading
+from concurrent.futures import Future
+
 import streamlit as st
 from config.settings import APP_PASSWORD
 from src.database.schema import initialize_database
-from src.database.preload_data import (
-    preload_similarity_table,
-    is_data_preloaded,
-    preload_stock,
-    is_stock_preloaded,
-)
 
 st.set_page_config(
     page_title="Agente MDF - Copiloto de Substituicao",
@@ -19,10 +17,53 @@ st.set_page_config(
 # Initialize database on first run
 initialize_database()
 
-# Auto-load bundled data (Grupo Locatelli similarity table + stock)
-if not is_data_preloaded():
-    with st.spinner("Carregando base de dados de similaridade..."):
-        result = preload_similarity_table()
+
+@st.cache_resource(show_spinner=False)
+def _start_bundled_preload() -> Future:
+    """
+    Start the bundled similarity + stock preload on a background thread,
+    at most once per server process, so no page render waits on it.
+    """
+    future = Future()
+
+    def run():
+        # preload_data pulls in pandas; importing it here keeps that off the
+        # script thread as well. The thread gets its own SQLite connection.
+        from src.database.connection import close_connection, get_connection
+        from src.database.preload_data import preload_all
+
+        get_connection(dedicated=True)
+        try:
+            future.set_result(preload_all())
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            close_connection()
+
+    threading.Thread(target=run, name="bundled-preload", daemon=True).start()
+    return future
+
+
+# Auto-load bundled data (Grupo Locatelli similarity table + stock) in one
+# transaction, in the background. Each session reports the outcome once it
+# is ready and remembers it in session_state. Failed preloads are evicted
+# from the cache so the next rerun retries.
+if not st.session_state.get("_bundled_preloaded"):
+    preload_future = _start_bundled_preload()
+    if not preload_future.done():
+        if not st.session_state.get("_bundled_preload_notified"):
+            st.session_state["_bundled_preload_notified"] = True
+            st.toast("Carregando dados iniciais em segundo plano...", icon="⏳")
+    else:
+        try:
+            preload_results = preload_future.result()
+        except Exception as e:
+            preload_results = {
+                "similarity": {"success": False, "error": str(e)},
+                "stock": {"success": False, "error": str(e)},
+            }
+
+        result = preload_results["similarity"]
         if result.get("success") and result.get("products_created", 0) > 0:
             st.toast(
                 f"Similaridade: {result.get('products_created', 0)} produtos, "
@@ -32,9 +73,7 @@ if not is_data_preloaded():
         elif result.get("error"):
             st.toast(f"Aviso: {result['error']}", icon="⚠️")
 
-if not is_stock_preloaded():
-    with st.spinner("Carregando estoque..."):
-        result = preload_stock()
+        result = preload_results["stock"]
         if result.get("success") and result.get("stock_entries", 0) > 0:
             st.toast(
                 f"Estoque: {result.get('stock_entries', 0)} itens, "
@@ -45,6 +84,20 @@ if not is_stock_preloaded():
         elif result.get("error"):
             st.toast(f"Aviso estoque: {result['error']}", icon="⚠️")
 
+        if all(r.get("success") for r in preload_results.values()):
+            st.session_state["_bundled_preloaded"] = True
+        else:
+            _start_bundled_preload.clear()
+
+
+def _prefetch_ui_modules():
+    """Import the sidebar/chat modules so the post-login render hits sys.modules."""
+    for module_name in ("src.ui.sidebar", "src.ui.chat_interface", "anthropic"):
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            pass
+
 
 def check_password() -> bool:
     """Simple password authentication."""
@@ -60,6 +113,12 @@ def check_password() -> bool:
     st.title("Agente MDF")
     st.caption("Copiloto inteligente para substituicao de MDF")
 
+    # Warm up the post-login UI modules (and the anthropic SDK behind them)
+    # while the user types the password.
+    if not st.session_state.get("_ui_prefetched"):
+        st.session_state["_ui_prefetched"] = True
+        threading.Thread(target=_prefetch_ui_modules, daemon=True).start()
+
     password = st.text_input("Senha de acesso", type="password")
     if st.button("Entrar", use_container_width=True):
         if password == APP_PASSWORD:
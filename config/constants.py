@@ -1,13 +1,14 @@
 """Constants and enums for the MDF Agent system."""
 
-# Product categories
-CATEGORIES = ["Madeirado", "Unicolor", "Fantasia", "Conceito"]
+# Product categories (ordered for display; CATEGORIES for membership checks)
+CATEGORIES_ORDERED = ("Madeirado", "Unicolor", "Fantasia", "Conceito")
+CATEGORIES = frozenset(CATEGORIES_ORDERED)
 
 # Tape compatibility types
-TAPE_COMPATIBILITY_TYPES = ["official", "recommended", "alternative"]
+TAPE_COMPATIBILITY_TYPES = frozenset({"official", "recommended", "alternative"})
 
 # Feedback suggestion types
-SUGGESTION_TYPES = ["direct_equivalence", "visual_similarity"]
+SUGGESTION_TYPES = frozenset({"direct_equivalence", "visual_similarity"})
 
 # Import data types
 IMPORT_TYPES = {
@@ -18,4 +19,4 @@ IMPORT_TYPES = {
 }
 
 # Import statuses
-IMPORT_STATUSES = ["pending", "success", "partial", "failed"]
+IMPORT_STATUSES = frozenset({"pending", "success", "partial", "failed"})
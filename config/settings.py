@@ -1,18 +1,25 @@
+"""Application settings.
+
+Values come from Streamlit secrets or environment variables. A `.env` file
+is only read from the project root; python-dotenv's search through the
+working directory and its parents is not used.
+"""
+
 import os
+import unicodedata
 from pathlib import Path
+from types import MappingProxyType
+from typing import Final
 from dotenv import load_dotenv
 
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent
 
-# Load .env from project root
-# Use stream for reliable unicode path support on Windows
+# Load .env from project root only (no upward directory search)
+# Pass an explicit str path + encoding for reliable unicode support on Windows
 _env_file = PROJECT_ROOT / ".env"
 if _env_file.exists():
-    with open(_env_file, "r", encoding="utf-8") as _f:
-        load_dotenv(stream=_f, override=True)
-else:
-    load_dotenv()
+    load_dotenv(dotenv_path=os.fspath(_env_file), override=True, encoding="utf-8")
 DATA_DIR = PROJECT_ROOT / "data"
 DB_PATH = DATA_DIR / "db" / "mdf_agent.db"
 RAW_DATA_DIR = DATA_DIR / "raw"
@@ -36,7 +43,7 @@ def _get_config(key: str, default: str = "") -> str:
 # Claude API
 CLAUDE_API_KEY = _get_config("ANTHROPIC_API_KEY", "")
 CLAUDE_MODEL = _get_config("CLAUDE_MODEL", "claude-sonnet-4-20250514")
-CLAUDE_MAX_TOKENS = int(_get_config("CLAUDE_MAX_TOKENS", "4096"))
+CLAUDE_MAX_TOKENS: Final[int] = int(_get_config("CLAUDE_MAX_TOKENS", "4096"))
 
 # Web Search (Brave Search API)
 BRAVE_API_KEY = _get_config("BRAVE_API_KEY", "")
@@ -45,12 +52,12 @@ BRAVE_API_KEY = _get_config("BRAVE_API_KEY", "")
 APP_PASSWORD = _get_config("APP_PASSWORD", "")
 
 # Stock
-DEFAULT_MIN_STOCK = 1.0
+DEFAULT_MIN_STOCK: Final[float] = 1.0
 PRIMARY_LOCATION = _get_config("PRIMARY_LOCATION", "principal")
 CENTRAL_STOCK_FILE = Path(
     _get_config("CENTRAL_STOCK_FILE", str(DATA_DIR / "raw" / "central_trocas.xlsx"))
 )
-CENTRAL_STOCK_REQUIRED = _get_config("CENTRAL_STOCK_REQUIRED", "true").lower() in (
+CENTRAL_STOCK_REQUIRED: Final[bool] = _get_config("CENTRAL_STOCK_REQUIRED", "true").lower() in (
     "1",
     "true",
     "yes",
@@ -58,15 +65,15 @@ CENTRAL_STOCK_REQUIRED = _get_config("CENTRAL_STOCK_REQUIRED", "true").lower() i
 )
 
 # Search
-FUZZY_MATCH_THRESHOLD = 0.6
-MAX_SEARCH_RESULTS = 10
+FUZZY_MATCH_THRESHOLD: Final[float] = 0.6
+MAX_SEARCH_RESULTS: Final[int] = 10
 
 # Similarity (Claude Vision)
-MAX_VISUAL_CANDIDATES_PER_BATCH = 5
-SIMILARITY_CACHE_DAYS = 30
+MAX_VISUAL_CANDIDATES_PER_BATCH: Final[int] = 5
+SIMILARITY_CACHE_DAYS: Final[int] = 30
 
 # Edging tape stock
-TAPE_METERS_PER_ROLL = float(_get_config("TAPE_METERS_PER_ROLL", "20"))
+TAPE_METERS_PER_ROLL: Final[float] = float(_get_config("TAPE_METERS_PER_ROLL", "20"))
 
 # Import - column name mappings (Portuguese -> English)
 PRODUCT_COLUMN_MAP = {
@@ -191,5 +198,23 @@ TAPE_COLUMN_MAP = {
     "stock": "quantity_available",
 }
 
+
+def _normalized_column_map(column_map: dict) -> MappingProxyType:
+    """Fold map keys to the accent-free lowercase form produced by
+    normalize_column_name, so header lookups need no per-key variants."""
+    folded = {}
+    for key, value in column_map.items():
+        ascii_key = (
+            unicodedata.normalize("NFKD", key).encode("ascii", "ignore").decode().lower()
+        )
+        folded.setdefault(ascii_key, value)
+    return MappingProxyType(folded)
+
+
+PRODUCT_COLUMN_MAP_NORM = _normalized_column_map(PRODUCT_COLUMN_MAP)
+STOCK_COLUMN_MAP_NORM = _normalized_column_map(STOCK_COLUMN_MAP)
+EQUIVALENCE_COLUMN_MAP_NORM = _normalized_column_map(EQUIVALENCE_COLUMN_MAP)
+TAPE_COLUMN_MAP_NORM = _normalized_column_map(TAPE_COLUMN_MAP)
+
 # Supported file types for import
 SUPPORTED_FILE_TYPES = [".csv", ".xlsx", ".xls"]
@@ -1,12 +1,29 @@
 """Anthropic Claude API wrapper."""
 
-import anthropic
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
 from config.settings import CLAUDE_API_KEY, CLAUDE_MODEL, CLAUDE_MAX_TOKENS
 
+if TYPE_CHECKING:
+    import anthropic
+
+
+@lru_cache(maxsize=4)
+def get_anthropic_client(api_key: str = None) -> anthropic.Anthropic:
+    """Return a shared Anthropic client so HTTP connections are reused across requests."""
+    # Imported lazily: the SDK (httpx, pydantic) is slow to import and is
+    # not needed until the first request, e.g. not on the password screen.
+    import anthropic
+
+    return anthropic.Anthropic(api_key=api_key or CLAUDE_API_KEY)
+
 
 class ClaudeClient:
     def __init__(self, api_key: str = None):
-        self.client = anthropic.Anthropic(api_key=api_key or CLAUDE_API_KEY)
+        self.client = get_anthropic_client(api_key or CLAUDE_API_KEY)
         self.model = CLAUDE_MODEL
 
     def chat(
@@ -15,14 +32,32 @@ class ClaudeClient:
         system_prompt: str,
         tools: list[dict] | None = None,
         max_tokens: int = None,
+        cache_system: bool = True,
     ) -> anthropic.types.Message:
-        """Send a chat request to Claude with optional tools."""
+        """Send a chat request to Claude with optional tools.
+
+        With cache_system, the system prompt and tool definitions are marked
+        with cache_control so the API can reuse the cached prompt prefix
+        across turns instead of reprocessing it on every request.
+        """
+        system = system_prompt
+        if cache_system:
+            system = [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
         params = {
             "model": self.model,
             "max_tokens": max_tokens or CLAUDE_MAX_TOKENS,
-            "system": system_prompt,
+            "system": system,
             "messages": messages,
         }
         if tools:
+            if cache_system:
+                # Cache breakpoint on the last tool covers the whole tools block
+                tools = tools[:-1] + [{**tools[-1], "cache_control": {"type": "ephemeral"}}]
             params["tools"] = tools
         return self.client.messages.create(**params)
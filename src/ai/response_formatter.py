@@ -3,6 +3,37 @@
 from src.database import queries
 from src.services import edging_tape_service
 
+# (header, explanation) per suggestion type; anything else is a visual alternative
+_SUGGESTION_COPY = {
+    "direct_equivalence": (
+        "SUBSTITUICAO - EQUIVALENCIA DIRETA",
+        "Este produto e equivalente oficial ao solicitado, apenas de marca diferente.",
+    ),
+    "web_suggestion": (
+        "SUGESTAO - REFERENCIA DE MERCADO",
+        "Este produto foi identificado como alternativa com base em "
+        "referencias de mercado e esta disponivel em nosso estoque.",
+    ),
+}
+_VISUAL_COPY = (
+    "SUGESTAO - ALTERNATIVA VISUAL",
+    "Este produto mantem o mesmo conceito estetico do solicitado, "
+    "com visual muito semelhante.",
+)
+
+_CLIENT_TEXT_TEMPLATE = (
+    "{header}\n"
+    "\n"
+    "Produto solicitado: {original_brand} {original_name} ({original_code})\n"
+    "Status: Indisponivel no momento\n"
+    "\n"
+    "Alternativa sugerida: {substitute_brand} {substitute_name} ({substitute_code})\n"
+    "{details}"
+    "\n"
+    "{explanation}"
+    "{tape_text}"
+)
+
 
 def generate_client_text(
     original_product_id: int,
@@ -10,70 +41,68 @@ def generate_client_text(
     suggestion_type: str,
 ) -> dict:
     """Generate copy-to-clipboard text for the client."""
-    original = queries.get_product_by_id(original_product_id)
-    substitute = queries.get_product_by_id(suggested_product_id)
+    original = queries.get_product_by_id_cached(original_product_id)
+    substitute = queries.get_product_by_id_cached(suggested_product_id)
 
     if not original or not substitute:
         return {"success": False, "error": "Produto nao encontrado"}
+    original = dict(original)
+    substitute = dict(substitute)
 
-    if suggestion_type == "direct_equivalence":
-        header = "SUBSTITUICAO - EQUIVALENCIA DIRETA"
-        explanation = "Este produto e equivalente oficial ao solicitado, apenas de marca diferente."
-    elif suggestion_type == "web_suggestion":
-        header = "SUGESTAO - REFERENCIA DE MERCADO"
-        explanation = (
-            "Este produto foi identificado como alternativa com base em "
-            "referencias de mercado e esta disponivel em nosso estoque."
-        )
-    else:
-        header = "SUGESTAO - ALTERNATIVA VISUAL"
-        explanation = (
-            "Este produto mantem o mesmo conceito estetico do solicitado, "
-            "com visual muito semelhante."
-        )
+    header, explanation = _SUGGESTION_COPY.get(suggestion_type, _VISUAL_COPY)
 
     # Get edging tape
-    tapes = edging_tape_service.find_tape_for_substitute(
+    tape = edging_tape_service.find_first_tape_for_substitute(
         original_product_id, suggested_product_id
     )
-    tape_text = ""
-    if tapes:
-        tape = tapes[0]
-        tape_text = (
+    tape_lines = []
+    if tape:
+        tape_lines.append(
             f"\nFita de borda compativel: {tape['brand']} {tape['tape_name']} "
             f"({tape['tape_code']})"
         )
         if "quantity_available" in tape:
-            tape_text += f"\nEstoque fita: {_format_rolls(tape.get('quantity_available', 0))} rolos"
-
-    text = (
-        f"{header}\n"
-        f"\n"
-        f"Produto solicitado: {original['brand']} {original['product_name']} ({original['product_code']})\n"
-        f"Status: Indisponivel no momento\n"
-        f"\n"
-        f"Alternativa sugerida: {substitute['brand']} {substitute['product_name']} ({substitute['product_code']})\n"
-    )
+            tape_lines.append(
+                f"\nEstoque fita: {_format_rolls(tape.get('quantity_available', 0))} rolos"
+            )
 
+    details = []
     if substitute.get("thickness_mm"):
-        text += f"Espessura: {substitute['thickness_mm']}mm\n"
+        details.append(f"Espessura: {substitute['thickness_mm']}mm\n")
     if substitute.get("finish"):
-        text += f"Acabamento: {substitute['finish']}\n"
+        details.append(f"Acabamento: {substitute['finish']}\n")
 
-    text += f"\n{explanation}"
-    text += tape_text
+    text = _CLIENT_TEXT_TEMPLATE.format_map(
+        {
+            "header": header,
+            "original_brand": original["brand"],
+            "original_name": original["product_name"],
+            "original_code": original["product_code"],
+            "substitute_brand": substitute["brand"],
+            "substitute_name": substitute["product_name"],
+            "substitute_code": substitute["product_code"],
+            "details": "".join(details),
+            "explanation": explanation,
+            "tape_text": "".join(tape_lines),
+        }
+    )
 
+    # Template starts at the header and ends at the explanation/tape line,
+    # so there is no surrounding whitespace to strip.
     return {
         "success": True,
-        "text": text.strip(),
+        "text": text,
     }
 
 
 def _format_rolls(value: float) -> str:
-    try:
-        v = float(value)
-    except Exception:
-        return "0"
-    if v.is_integer():
-        return str(int(v))
-    return f"{v:.2f}".rstrip("0").rstrip(".")
+    if type(value) is int:
+        return str(value)
+    if not isinstance(value, float):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return "0"
+    if value.is_integer():
+        return str(int(value))
+    return f"{value:.2f}".rstrip("0").rstrip(".")
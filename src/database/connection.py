@@ -1,31 +1,96 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from config.settings import DB_PATH
 
 
 _connection: sqlite3.Connection | None = None
+_connection_lock = threading.Lock()
+_local = threading.local()
 
 
-def get_connection() -> sqlite3.Connection:
-    """Get or create a singleton SQLite connection."""
+def _connect(check_same_thread: bool) -> sqlite3.Connection:
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        str(DB_PATH),
+        check_same_thread=check_same_thread,
+        timeout=30,
+        cached_statements=256,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.execute("PRAGMA synchronous=NORMAL")  # WAL-safe, no fsync per commit
+    conn.execute("PRAGMA cache_size=-65536")  # ~64 MB page cache
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    return conn
+
+
+def get_connection(dedicated: bool = False) -> sqlite3.Connection:
+    """
+    Get the SQLite connection for the calling thread.
+
+    Script threads share one process-wide connection; Streamlit starts
+    every rerun on a new thread, so per-thread handles would only pile up.
+    Background threads that run next to them (tool pool, bundled preload)
+    pass dedicated=True once to open their own handle, which every later
+    call on that thread returns until close_connection().
+    """
     global _connection
-    if _connection is None:
-        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        _connection = sqlite3.connect(
-            str(DB_PATH),
-            check_same_thread=False,
-            timeout=30,
-        )
-        _connection.row_factory = sqlite3.Row
-        _connection.execute("PRAGMA journal_mode=WAL")
-        _connection.execute("PRAGMA foreign_keys=ON")
-        _connection.execute("PRAGMA busy_timeout=30000")
-    return _connection
+    conn = getattr(_local, "connection", None)
+    if conn is not None:
+        return conn
+    if dedicated:
+        conn = _local.connection = _connect(check_same_thread=True)
+        return conn
+    with _connection_lock:
+        if _connection is None:
+            _connection = _connect(check_same_thread=False)
+        return _connection
 
 
 def close_connection():
-    """Close the singleton connection."""
+    """Close the calling thread's dedicated connection, or else the shared one."""
     global _connection
-    if _connection is not None:
-        _connection.close()
-        _connection = None
+    conn = getattr(_local, "connection", None)
+    if conn is not None:
+        conn.close()
+        _local.connection = None
+        return
+    with _connection_lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+
+
+@contextmanager
+def bulk_write(conn: sqlite3.Connection, relax_sync: bool = False):
+    """
+    Run a bulk load as a single transaction.
+
+    Takes the write lock up front with BEGIN IMMEDIATE (unless a
+    transaction is already open), commits once on success and rolls back
+    on error. The connection's synchronous level is kept unless relax_sync
+    is set, which lowers it to OFF for the duration: reserved for data that
+    can be reloaded from its source (the bundled preload). With OFF neither
+    the commit nor a WAL checkpoint it triggers is fsynced, so a power loss
+    can drop more than the last transaction.
+    """
+    previous = None
+    if relax_sync:
+        previous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        conn.execute("PRAGMA synchronous=OFF")
+    try:
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if previous is not None:
+            conn.execute(f"PRAGMA synchronous={int(previous)}")
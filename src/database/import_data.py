@@ -1,12 +1,19 @@
-"""CSV/Excel import pipeline into SQLite."""
+"""CSV/Excel import pipeline into SQLite.
 
-import pandas as pd
-from typing import IO
+pandas (and preload_data, which needs it) is imported inside the functions
+that use it, so importing this module stays cheap until a file is imported.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sqlite3
+
+from typing import IO, TYPE_CHECKING, Mapping
 from dataclasses import dataclass
 
-from src.database.connection import get_connection
-from src.database.queries import log_import, get_product_by_code
-from src.database.preload_data import _parse_product_name, _match_existing_product
+from src.database.connection import get_connection, bulk_write
+from src.database.queries import log_import, invalidate_query_caches
 from src.utils.text_processing import normalize_column_name
 from src.utils.validators import (
     validate_product_dataframe,
@@ -15,13 +22,16 @@ from src.utils.validators import (
     validate_tape_dataframe,
 )
 from config.settings import (
-    PRODUCT_COLUMN_MAP,
-    STOCK_COLUMN_MAP,
-    EQUIVALENCE_COLUMN_MAP,
-    TAPE_COLUMN_MAP,
+    PRODUCT_COLUMN_MAP_NORM,
+    STOCK_COLUMN_MAP_NORM,
+    EQUIVALENCE_COLUMN_MAP_NORM,
+    TAPE_COLUMN_MAP_NORM,
     PRIMARY_LOCATION,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 @dataclass
 class ImportResult:
@@ -38,67 +48,174 @@ class ImportResult:
             self.warnings = []
 
 
+# pyarrow parses CSVs multi-threaded; it's optional, so fall back to the C parser
+_CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+# Same idea for spreadsheets: python-calamine when installed, else openpyxl
+_EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+
 def _read_file(file: IO, file_name: str) -> pd.DataFrame:
     """Read CSV or Excel file into DataFrame."""
+    import pandas as pd
+
     if file_name.endswith(".csv"):
-        return pd.read_csv(file, encoding="utf-8-sig")
+        return pd.read_csv(file, encoding="utf-8-sig", engine=_CSV_ENGINE)
     elif file_name.endswith((".xlsx", ".xls")):
-        return pd.read_excel(file)
+        return pd.read_excel(file, engine=_EXCEL_ENGINE)
     else:
         raise ValueError(f"Tipo de arquivo nao suportado: {file_name}")
 
 
-def _map_columns(df: pd.DataFrame, column_map: dict) -> pd.DataFrame:
-    """Map column names from Portuguese/variant to standardized English names."""
-    rename_map = {}
-    for col in df.columns:
-        normalized = normalize_column_name(col)
-        if normalized in column_map:
-            rename_map[col] = column_map[normalized]
-    return df.rename(columns=rename_map)
+def _map_columns(df: pd.DataFrame, column_map: Mapping[str, str]) -> pd.DataFrame:
+    """Map column names from Portuguese/variant to standardized English names.
+
+    Headers are relabelled in place (once per file) rather than through
+    df.rename, which would copy the whole frame.
+    """
+    df.columns = [column_map.get(normalize_column_name(col), col) for col in df.columns]
+    return df
+
+
+def _executemany_with_fallback(conn, sql: str, rows: list[tuple]) -> int:
+    """
+    Write all rows with one executemany. If the batch fails, undo it and
+    retry row by row so one bad row doesn't sink the rest.
+
+    Returns the number of rows that could not be written.
+    """
+    conn.execute("SAVEPOINT import_batch")
+    try:
+        conn.executemany(sql, rows)
+        conn.execute("RELEASE import_batch")
+        return 0
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO import_batch")
+
+    failed = 0
+    for params in rows:
+        try:
+            conn.execute(sql, params)
+        except sqlite3.Error:
+            failed += 1
+    conn.execute("RELEASE import_batch")
+    return failed
+
+
+def _coerce_columns(
+    df: pd.DataFrame,
+    numeric: tuple[str, ...] = (),
+    text: tuple[str, ...] = (),
+    defaults: Mapping[str, object] | None = None,
+    required: tuple[str, ...] = (),
+) -> pd.Series:
+    """
+    Normalize column types in place with one vectorized pass per column:
+    numeric columns go through pd.to_numeric, text columns are stripped.
+    Missing cells, and columns absent from the file, take the value from
+    defaults or None.
+
+    Returns a boolean mask of rows holding a non-numeric value in a numeric
+    column or no value in a required (NOT NULL) column, so callers can count
+    them as failed without sending them to the database.
+    """
+    import pandas as pd
+
+    defaults = defaults or {}
+    invalid = pd.Series(False, index=df.index)
+    for col in (*numeric, *text):
+        if col not in df.columns:
+            df[col] = defaults.get(col)
+    for col in numeric:
+        values = pd.to_numeric(df[col], errors="coerce").astype(float)
+        invalid |= values.isna() & df[col].notna()
+        df[col] = values
+    for col in text:
+        df[col] = df[col].astype("string").str.strip()
+    for col in (*numeric, *text):
+        values = df[col]
+        if col in defaults:
+            values = values.fillna(defaults[col])
+        values = values.astype(object)
+        df[col] = values.where(values.notna(), None)
+    for col in required:
+        invalid |= df[col].isna()
+    return invalid
+
+
+def _valid_rows(df: pd.DataFrame, invalid: pd.Series, keys) -> tuple[pd.DataFrame, int]:
+    """
+    Rows to write: those not flagged by _coerce_columns, with rows repeating
+    the same keys collapsed to the last one. Earlier repeats would only be
+    overwritten by the later row's upsert, so they are skipped rather than
+    written twice. Returns the rows and how many repeats were dropped.
+    """
+    valid = df.loc[~invalid]
+    duplicated = valid.duplicated(keys, keep="last")
+    return valid.loc[~duplicated], int(duplicated.sum())
+
+
+def _map_ids(keys: pd.Series, ids: Mapping) -> pd.Series:
+    """Look a key column up in an id index in one pass; misses become None."""
+    mapped = keys.map(ids).astype("Int64").astype(object)
+    return mapped.where(mapped.notna(), None)
+
+
+def _fetch_active_products(conn) -> list[sqlite3.Row]:
+    """
+    Fetch the identifying columns of all active products in one query.
+    Importers build their code/name -> id indexes from it instead of
+    querying per row.
+    """
+    return conn.execute(
+        "SELECT id, product_code, brand, product_name FROM products WHERE is_active = 1"
+    ).fetchall()
 
 
 def import_products(file: IO, file_name: str) -> ImportResult:
     """Import MDF product data from CSV/Excel."""
     try:
         df = _read_file(file, file_name)
-        df = _map_columns(df, PRODUCT_COLUMN_MAP)
+        df = _map_columns(df, PRODUCT_COLUMN_MAP_NORM)
 
         validation = validate_product_dataframe(df)
         if not validation.is_valid:
             log_import(file_name, "products", 0, 0, "failed", "; ".join(validation.errors))
             return ImportResult(False, errors=validation.errors, warnings=validation.warnings)
 
-        conn = get_connection()
-        imported = 0
-        failed = 0
+        invalid = _coerce_columns(
+            df,
+            numeric=("thickness_mm", "width_mm", "height_mm"),
+            text=(
+                "brand", "product_name", "product_code", "finish",
+                "color_family", "category", "image_path",
+            ),
+            required=("brand", "product_name", "product_code"),
+        )
 
-        for _, row in df.iterrows():
-            try:
-                conn.execute(
-                    """INSERT OR REPLACE INTO products
-                       (brand, product_name, product_code, thickness_mm, finish,
-                        width_mm, height_mm, color_family, category, image_path,
-                        updated_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
-                    (
-                        str(row["brand"]).strip(),
-                        str(row["product_name"]).strip(),
-                        str(row["product_code"]).strip(),
-                        float(row["thickness_mm"]) if pd.notna(row.get("thickness_mm")) else None,
-                        str(row["finish"]).strip() if pd.notna(row.get("finish")) else None,
-                        float(row["width_mm"]) if pd.notna(row.get("width_mm")) else None,
-                        float(row["height_mm"]) if pd.notna(row.get("height_mm")) else None,
-                        str(row["color_family"]).strip() if pd.notna(row.get("color_family")) else None,
-                        str(row["category"]).strip() if pd.notna(row.get("category")) else None,
-                        str(row["image_path"]).strip() if pd.notna(row.get("image_path")) else None,
-                    ),
-                )
-                imported += 1
-            except Exception:
-                failed += 1
-
-        conn.commit()
+        conn = get_connection()
+        columns = [
+            "brand", "product_name", "product_code", "thickness_mm", "finish",
+            "width_mm", "height_mm", "color_family", "category", "image_path",
+        ]
+        failed = int(invalid.sum())
+        # validation already warns about repeated codes
+        valid, _ = _valid_rows(df, invalid, "product_code")
+        rows = list(valid[columns].itertuples(index=False, name=None))
+
+        with bulk_write(conn):
+            batch_failed = _executemany_with_fallback(
+                conn,
+                """INSERT OR REPLACE INTO products
+                   (brand, product_name, product_code, thickness_mm, finish,
+                    width_mm, height_mm, color_family, category, image_path,
+                    updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
+                rows,
+            )
+        imported = len(rows) - batch_failed
+        failed += batch_failed
+
+        invalidate_query_caches()
         status = "success" if failed == 0 else "partial"
         log_import(file_name, "products", imported, failed, status)
         return ImportResult(True, imported, failed, warnings=validation.warnings)
@@ -112,7 +229,7 @@ def import_stock(file: IO, file_name: str) -> ImportResult:
     """Import stock data from CSV/Excel."""
     try:
         df = _read_file(file, file_name)
-        df = _map_columns(df, STOCK_COLUMN_MAP)
+        df = _map_columns(df, STOCK_COLUMN_MAP_NORM)
         pre_warnings = []
 
         # If section column exists, keep only MDF "Chapas"
@@ -139,111 +256,120 @@ def import_stock(file: IO, file_name: str) -> ImportResult:
             warnings = (validation.warnings or []) + pre_warnings
             return ImportResult(False, errors=validation.errors, warnings=warnings)
 
+        invalid = _coerce_columns(
+            df,
+            numeric=("quantity_available", "quantity_reserved", "minimum_stock"),
+            text=("product_code", "brand", "product_name", "location", "unit"),
+            defaults={
+                "quantity_available": 0.0,
+                "quantity_reserved": 0.0,
+                "minimum_stock": 0.0,
+                "location": PRIMARY_LOCATION,
+                "unit": "chapa",
+            },
+        )
+
         conn = get_connection()
-        imported = 0
+        rows_by_key = {}  # (product_id, location) -> row; the last one wins
+        resolved = 0
         failed = 0
 
-        for _, row in df.iterrows():
-            try:
-                # If section column exists, only import MDF "Chapas"
-                section_value = ""
-                if "section" in df.columns and pd.notna(row.get("section")):
-                    section_value = str(row.get("section")).strip().lower()
-                if section_value and "chapa" not in section_value:
+        active_products = _fetch_active_products(conn)
+        ids_by_code = {}
+        ids_by_brand_name = {}
+        for product in active_products:
+            ids_by_code.setdefault(product["product_code"], product["id"])
+            ids_by_brand_name.setdefault(
+                (str(product["brand"]).upper(), str(product["product_name"]).upper()),
+                product["id"],
+            )
+        from src.database.preload_data import (
+            _parse_product_name,
+            _match_existing_product,
+            _build_brand_cache,
+            _db_brand,
+        )
+
+        brand_cache = None  # built on the first row that needs fuzzy matching
+
+        # Resolve codes column-wise; only misses go through the name fallback
+        df["product_id"] = _map_ids(df["product_code"], ids_by_code)
+        # Brand is only compared upper-cased; the name is also needed as-is
+        # for _parse_product_name, so its upper-cased key gets its own column
+        df["brand"] = df["brand"].str.upper()
+        df["product_name_upper"] = df["product_name"].str.upper()
+
+        columns = [
+            "product_id", "brand", "product_name", "product_name_upper",
+            "quantity_available", "quantity_reserved", "minimum_stock",
+            "location", "unit",
+        ]
+        failed += int(invalid.sum())
+        valid = df.loc[~invalid]
+        for (
+            product_id, brand, product_name, name,
+            qty_available, qty_reserved, minimum_stock, location, unit,
+        ) in valid[columns].itertuples(index=False, name=None):
+            if product_id is None:
+                # Fallback: match by brand + product_name if present
+                if brand is not None and product_name is not None:
+                    if brand and name:
+                        product_id = ids_by_brand_name.get((brand, name))
+                    if product_id is None:
+                        if brand_cache is None:
+                            # Uploaded sheets match brands case-sensitively,
+                            # as the uncached `brand = ?` query did
+                            brand_cache = _build_brand_cache(conn, fold_brand_case=False)
+                        parsed = _parse_product_name(product_name, brand)
+                        product_id = _match_existing_product(
+                            conn,
+                            parsed,
+                            _db_brand(brand),
+                            brand_cache=brand_cache,
+                            fuzzy_thickness=False,
+                        )
+                if product_id is None:
+                    failed += 1
                     continue
 
-                code = str(row["product_code"]).strip()
-                product = get_product_by_code(code)
-                if not product:
-                    # Fallback: match by brand + product_name if present
-                    if pd.notna(row.get("brand")) and pd.notna(row.get("product_name")):
-                        brand = str(row.get("brand")).strip().upper()
-                        name = str(row.get("product_name")).strip().upper()
-                        if brand and name:
-                            product = conn.execute(
-                                "SELECT * FROM products WHERE UPPER(product_name) = ? AND UPPER(brand) = ? AND is_active = 1",
-                                (name, brand),
-                            ).fetchone()
-                        if not product:
-                            parsed = _parse_product_name(
-                                str(row.get("product_name")).strip(),
-                                brand,
-                            )
-                            matched_id = _match_existing_product(conn, parsed, brand)
-                            if matched_id:
-                                product = conn.execute(
-                                    "SELECT * FROM products WHERE id = ? AND is_active = 1",
-                                    (matched_id,),
-                                ).fetchone()
-                    if not product:
-                        failed += 1
-                        continue
-
-                location = (
-                    str(row.get("location", PRIMARY_LOCATION)).strip()
-                    if pd.notna(row.get("location"))
-                    else PRIMARY_LOCATION
-                )
-                unit = (
-                    str(row.get("unit", "chapa")).strip()
-                    if pd.notna(row.get("unit"))
-                    else "chapa"
-                )
-                qty_available = (
-                    float(row["quantity_available"])
-                    if pd.notna(row.get("quantity_available"))
-                    else 0
-                )
-                qty_reserved = (
-                    float(row.get("quantity_reserved", 0))
-                    if pd.notna(row.get("quantity_reserved"))
-                    else 0
-                )
-                minimum_stock = (
-                    float(row.get("minimum_stock", 0))
-                    if pd.notna(row.get("minimum_stock"))
-                    else 0
-                )
-
-                existing = conn.execute(
-                    "SELECT id FROM stock WHERE product_id = ? AND location = ?",
-                    (product["id"], location),
-                ).fetchone()
-
-                if existing:
-                    conn.execute(
-                        """UPDATE stock
-                           SET quantity_available = ?, quantity_reserved = ?,
-                               minimum_stock = ?, unit = ?, last_updated = CURRENT_TIMESTAMP
-                           WHERE id = ?""",
-                        (
-                            qty_available,
-                            qty_reserved,
-                            minimum_stock,
-                            unit,
-                            existing["id"],
-                        ),
-                    )
-                else:
-                    conn.execute(
-                        """INSERT INTO stock
-                           (product_id, quantity_available, quantity_reserved,
-                            minimum_stock, location, unit, last_updated)
-                           VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
-                        (
-                            product["id"],
-                            qty_available,
-                            qty_reserved,
-                            minimum_stock,
-                            location,
-                            unit,
-                        ),
-                    )
-                imported += 1
-            except Exception:
-                failed += 1
-
-        conn.commit()
+            # Codes that fell back to brand + name can share one placeholder
+            # value, so repeats are only detected once the product is known
+            resolved += 1
+            rows_by_key.pop((product_id, location), None)
+            rows_by_key[(product_id, location)] = (
+                product_id,
+                qty_available,
+                qty_reserved,
+                minimum_stock,
+                location,
+                unit,
+            )
+
+        rows = list(rows_by_key.values())
+        duplicates = resolved - len(rows)
+        if duplicates:
+            pre_warnings.append(
+                f"{duplicates} linhas duplicadas ignoradas (mesmo produto e local)"
+            )
+
+        with bulk_write(conn):
+            batch_failed = _executemany_with_fallback(
+                conn,
+                """INSERT INTO stock
+                   (product_id, quantity_available, quantity_reserved,
+                    minimum_stock, location, unit, last_updated)
+                   VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                   ON CONFLICT(product_id, location) DO UPDATE SET
+                       quantity_available = excluded.quantity_available,
+                       quantity_reserved = excluded.quantity_reserved,
+                       minimum_stock = excluded.minimum_stock,
+                       unit = excluded.unit,
+                       last_updated = CURRENT_TIMESTAMP""",
+                rows,
+            )
+        imported = len(rows) - batch_failed
+        failed += batch_failed
+
         status = "success" if failed == 0 else "partial"
         log_import(file_name, "stock", imported, failed, status)
         warnings = (validation.warnings or []) + pre_warnings
@@ -258,62 +384,71 @@ def import_equivalences(file: IO, file_name: str) -> ImportResult:
     """Import direct equivalence mappings from CSV/Excel."""
     try:
         df = _read_file(file, file_name)
-        df = _map_columns(df, EQUIVALENCE_COLUMN_MAP)
+        df = _map_columns(df, EQUIVALENCE_COLUMN_MAP_NORM)
 
         validation = validate_equivalence_dataframe(df)
         if not validation.is_valid:
             log_import(file_name, "equivalences", 0, 0, "failed", "; ".join(validation.errors))
             return ImportResult(False, errors=validation.errors, warnings=validation.warnings)
 
-        conn = get_connection()
-        imported = 0
-        failed = 0
-
         has_codes = "code_a" in df.columns and "code_b" in df.columns
+        if has_codes:
+            key_columns = ["code_a", "code_b"]
+        else:
+            key_columns = ["product_name_a", "brand_a", "product_name_b", "brand_b"]
+        invalid = _coerce_columns(
+            df,
+            numeric=("confidence",),
+            text=(*key_columns, "equivalence_source"),
+            defaults={"confidence": 1.0},
+        )
 
-        for _, row in df.iterrows():
-            try:
-                if has_codes:
-                    product_a = get_product_by_code(str(row["code_a"]).strip())
-                    product_b = get_product_by_code(str(row["code_b"]).strip())
-                else:
-                    # Find by name + brand
-                    name_a = str(row["product_name_a"]).strip()
-                    brand_a = str(row["brand_a"]).strip()
-                    name_b = str(row["product_name_b"]).strip()
-                    brand_b = str(row["brand_b"]).strip()
-
-                    product_a = conn.execute(
-                        "SELECT * FROM products WHERE product_name = ? AND brand = ? AND is_active = 1",
-                        (name_a, brand_a),
-                    ).fetchone()
-                    product_b = conn.execute(
-                        "SELECT * FROM products WHERE product_name = ? AND brand = ? AND is_active = 1",
-                        (name_b, brand_b),
-                    ).fetchone()
-
-                if not product_a or not product_b:
-                    failed += 1
-                    continue
-
-                # Ensure consistent ordering (lower id first)
-                id_a = min(product_a["id"], product_b["id"])
-                id_b = max(product_a["id"], product_b["id"])
-
-                source = str(row.get("equivalence_source", "")).strip() if pd.notna(row.get("equivalence_source")) else None
-                confidence = float(row.get("confidence", 1.0)) if pd.notna(row.get("confidence")) else 1.0
+        conn = get_connection()
 
-                conn.execute(
-                    """INSERT OR IGNORE INTO direct_equivalences
-                       (product_id_a, product_id_b, equivalence_source, confidence)
-                       VALUES (?, ?, ?, ?)""",
-                    (id_a, id_b, source, confidence),
-                )
-                imported += 1
-            except Exception:
-                failed += 1
+        product_ids = {}
+        for product in _fetch_active_products(conn):
+            key = (
+                product["product_code"]
+                if has_codes
+                else (product["product_name"], product["brand"])
+            )
+            product_ids.setdefault(key, product["id"])
+
+        if has_codes:
+            keys_a, keys_b = df["code_a"], df["code_b"]
+        else:
+            # Find by name + brand
+            import pandas as pd
+
+            keys_a = pd.Series(list(zip(df["product_name_a"], df["brand_a"])), index=df.index)
+            keys_b = pd.Series(list(zip(df["product_name_b"], df["brand_b"])), index=df.index)
+        ids_a = _map_ids(keys_a, product_ids)
+        ids_b = _map_ids(keys_b, product_ids)
+
+        resolved = ids_a.notna() & ids_b.notna() & ~invalid
+        failed = int((~resolved).sum())
+        rows = [
+            # Ensure consistent ordering (lower id first)
+            (min(id_a, id_b), max(id_a, id_b), source, confidence)
+            for id_a, id_b, source, confidence in zip(
+                ids_a[resolved],
+                ids_b[resolved],
+                df.loc[resolved, "equivalence_source"],
+                df.loc[resolved, "confidence"],
+            )
+        ]
+
+        with bulk_write(conn):
+            batch_failed = _executemany_with_fallback(
+                conn,
+                """INSERT OR IGNORE INTO direct_equivalences
+                   (product_id_a, product_id_b, equivalence_source, confidence)
+                   VALUES (?, ?, ?, ?)""",
+                rows,
+            )
+        imported = len(rows) - batch_failed
+        failed += batch_failed
 
-        conn.commit()
         status = "success" if failed == 0 else "partial"
         log_import(file_name, "equivalences", imported, failed, status)
         return ImportResult(True, imported, failed, warnings=validation.warnings)
@@ -327,76 +462,55 @@ def import_edging_tapes(file: IO, file_name: str) -> ImportResult:
     """Import edging tape data from CSV/Excel."""
     try:
         df = _read_file(file, file_name)
-        df = _map_columns(df, TAPE_COLUMN_MAP)
+        df = _map_columns(df, TAPE_COLUMN_MAP_NORM)
 
         validation = validate_tape_dataframe(df)
         if not validation.is_valid:
             log_import(file_name, "tapes", 0, 0, "failed", "; ".join(validation.errors))
             return ImportResult(False, errors=validation.errors, warnings=validation.warnings)
 
-        conn = get_connection()
-        imported = 0
-        failed = 0
+        invalid = _coerce_columns(
+            df,
+            numeric=("width_mm", "thickness_mm", "quantity_available"),
+            text=("tape_code", "brand", "tape_name", "finish", "color_family"),
+            defaults={"quantity_available": 0.0},
+            required=("brand", "tape_name", "tape_code"),
+        )
 
-        for _, row in df.iterrows():
-            try:
-                tape_code = str(row["tape_code"]).strip()
-                brand = str(row["brand"]).strip()
-                tape_name = str(row["tape_name"]).strip()
-                width_mm = float(row["width_mm"]) if pd.notna(row.get("width_mm")) else None
-                thickness_mm = float(row["thickness_mm"]) if pd.notna(row.get("thickness_mm")) else None
-                finish = str(row["finish"]).strip() if pd.notna(row.get("finish")) else None
-                color_family = str(row["color_family"]).strip() if pd.notna(row.get("color_family")) else None
-                quantity_available = (
-                    float(row["quantity_available"])
-                    if pd.notna(row.get("quantity_available"))
-                    else 0
-                )
-
-                existing = conn.execute(
-                    "SELECT id FROM edging_tapes WHERE tape_code = ?",
-                    (tape_code,),
-                ).fetchone()
-
-                if existing:
-                    conn.execute(
-                        """UPDATE edging_tapes
-                           SET brand = ?, tape_name = ?, width_mm = ?, thickness_mm = ?,
-                               finish = ?, color_family = ?, quantity_available = ?
-                           WHERE id = ?""",
-                        (
-                            brand,
-                            tape_name,
-                            width_mm,
-                            thickness_mm,
-                            finish,
-                            color_family,
-                            quantity_available,
-                            existing["id"],
-                        ),
-                    )
-                else:
-                    conn.execute(
-                        """INSERT INTO edging_tapes
-                           (brand, tape_name, tape_code, width_mm, thickness_mm,
-                            finish, color_family, quantity_available)
-                           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                        (
-                            brand,
-                            tape_name,
-                            tape_code,
-                            width_mm,
-                            thickness_mm,
-                            finish,
-                            color_family,
-                            quantity_available,
-                        ),
-                    )
-                imported += 1
-            except Exception:
-                failed += 1
-
-        conn.commit()
+        conn = get_connection()
+        columns = [
+            "brand", "tape_name", "tape_code", "width_mm", "thickness_mm",
+            "finish", "color_family", "quantity_available",
+        ]
+        failed = int(invalid.sum())
+        valid, duplicates = _valid_rows(df, invalid, "tape_code")
+        if duplicates:
+            validation.add_warning(
+                f"{duplicates} codigos de fita duplicados (mantida a ultima linha)"
+            )
+        rows = list(valid[columns].itertuples(index=False, name=None))
+
+        with bulk_write(conn):
+            batch_failed = _executemany_with_fallback(
+                conn,
+                """INSERT INTO edging_tapes
+                   (brand, tape_name, tape_code, width_mm, thickness_mm,
+                    finish, color_family, quantity_available)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(tape_code) DO UPDATE SET
+                       brand = excluded.brand,
+                       tape_name = excluded.tape_name,
+                       width_mm = excluded.width_mm,
+                       thickness_mm = excluded.thickness_mm,
+                       finish = excluded.finish,
+                       color_family = excluded.color_family,
+                       quantity_available = excluded.quantity_available""",
+                rows,
+            )
+        imported = len(rows) - batch_failed
+        failed += batch_failed
+
+        invalidate_query_caches()
         status = "success" if failed == 0 else "partial"
         log_import(file_name, "tapes", imported, failed, status)
         return ImportResult(True, imported, failed, warnings=validation.warnings)
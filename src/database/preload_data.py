@@ -5,14 +5,17 @@ automatically creating products + equivalences + stock entries so all users
 have the data on first access.
 """
 
+import importlib.util
 import re
 import unicodedata
+from functools import lru_cache
+from itertools import combinations
 
 import pandas as pd
 from pathlib import Path
 
-from src.database.connection import get_connection
-from src.database.queries import log_import
+from src.database.connection import get_connection, bulk_write
+from src.database.queries import log_import, invalidate_query_caches
 
 from config.settings import (
     DATA_DIR,
@@ -25,6 +28,42 @@ BUNDLED_DIR = DATA_DIR / "bundled"
 SIMILARITY_FILE = BUNDLED_DIR / "TABELA_SIMILARIDADE_GRUPO_LOCATELLI_0209.xlsx"
 STOCK_FILE = BUNDLED_DIR / "estoque_atual.xlsx"
 
+# python-calamine (Rust) parses xlsx much faster than openpyxl; it's optional,
+# so fall back to pandas' default engine when it isn't installed
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+# Patterns used per stock row by the name/code parsers, compiled once
+_ERP_NUMERIC_RE = re.compile(r"\d+(?:\.0+)?")
+_THICKNESS_RE = re.compile(r'(\d+(?:[.,]\d+)?)\s*mm', re.IGNORECASE)
+_FACES_RE = re.compile(r'(\d)\s*f\b', re.IGNORECASE)
+_MATERIAL_PREFIX_RE = re.compile(r'^(Mdf|Mdp|Pvc|Bp|Hdf|Eucadur|Ripado)\s+', re.IGNORECASE)
+_THICKNESS_STRIP_RE = re.compile(r'\d+(?:[.,]\d+)?\s*mm')
+_FACES_STRIP_RE = re.compile(r'\d+\s*f\b', re.IGNORECASE)
+_DIMENSIONS_RE = re.compile(r'\d+[x,]\d+(?:[x,]\d+)?')  # dimensions like 2,75x1,85
+_PARENTHESIZED_RE = re.compile(r'\([^)]*\)')
+_HYDRO_RE = re.compile(r'Hidro/?Ultra', re.IGNORECASE)
+_DAMAGED_RE = re.compile(r'Avariado', re.IGNORECASE)
+_BOX_RE = re.compile(r'Cx\s*\d+', re.IGNORECASE)
+_DASH_RE = re.compile(r'\s*-\s*')
+_WHITESPACE_RE = re.compile(r'\s+')
+_TAPE_WIDTH_RE = re.compile(r'(\d+)\s*x\s*\d')
+_TAPE_THICKNESS_RE = re.compile(r'x\s*(\d+[.,]\d+)\s*mm')
+
+FINISH_KEYWORDS = (
+    "Design", "Silk", "Essencial", "Lacca", "Tx", "Matt",
+    "Supermatte", "Acetinatta", "Jateado", "Nature", "Natura",
+    "Pele", "Line", "Bold", "Chess", "Duna", "Trama",
+    "Orvalho", "Soft", "Liso",
+)
+# Keywords are detected as substrings of the lower-cased name ("Natura" also
+# hits "Natural"), so the lookup keeps (keyword, lowered) pairs, not word sets
+_FINISH_KEYWORDS_LOWER = tuple((k, k.lower()) for k in FINISH_KEYWORDS)
+# All finish keywords as whole words, removed in one pass
+_FINISH_WORDS_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(k) for k in FINISH_KEYWORDS) + r')\b',
+    re.IGNORECASE,
+)
+
 # The 7 manufacturers in column order (row index 1 of the spreadsheet)
 MANUFACTURERS = [
     "DURATEX",
@@ -36,15 +75,24 @@ MANUFACTURERS = [
     "BERNECK",
 ]
 
+# Words ignored when comparing product names word by word
+_STOPWORDS = frozenset({"DE", "DO", "DA", "E", "COM", "EM"})
+
+# Stock-sheet brand spellings that differ from the products table
+_BRAND_ALIASES = {
+    "PLACAS DO BRASIL": "PLACAS DO BRASIL",
+    "PLACAS": "PLACAS DO BRASIL",
+}
+
 
 def is_data_preloaded() -> bool:
     """Check if bundled data was already imported."""
     conn = get_connection()
     row = conn.execute(
-        "SELECT COUNT(*) as cnt FROM import_log WHERE file_name = ? AND status = 'success'",
+        "SELECT 1 FROM import_log WHERE file_name = ? AND status = 'success' LIMIT 1",
         ("PRELOAD_SIMILARITY_TABLE",),
     ).fetchone()
-    return (row["cnt"] or 0) > 0
+    return row is not None
 
 
 def preload_similarity_table() -> dict:
@@ -60,174 +108,239 @@ def preload_similarity_table() -> dict:
 
     Returns dict with import stats.
     """
+    skipped = _check_similarity_preload()
+    if skipped is not None:
+        return skipped
+
+    try:
+        conn = get_connection()
+        with bulk_write(conn, relax_sync=True):
+            # Another loader may have finished while we waited for the lock
+            skipped = _check_similarity_preload()
+            if skipped is None:
+                result = _load_similarity_table(conn)
+                _log_similarity_result(result)
+    except Exception as e:
+        log_import("PRELOAD_SIMILARITY_TABLE", "preload", 0, 0, "failed", str(e))
+        return {"success": False, "error": str(e)}
+    if skipped is not None:
+        return skipped
+
+    invalidate_query_caches()
+    _clear_parse_caches()
+    return result
+
+
+def _clear_parse_caches():
+    """Drop the memoized name parsing once a preload is done; it only pays off within one."""
+    _parse_product_name_cached.cache_clear()
+    _generate_product_code.cache_clear()
+    _infer_category.cache_clear()
+
+
+def _check_similarity_preload() -> dict | None:
+    """Return a result dict if the similarity preload must not run, else None."""
     if not SIMILARITY_FILE.exists():
         return {
             "success": False,
             "error": f"Arquivo nao encontrado: {SIMILARITY_FILE}",
         }
-
     if is_data_preloaded():
         return {"success": True, "message": "Dados ja carregados anteriormente."}
+    return None
 
-    try:
-        # Read without headers — we'll parse manually
-        df = pd.read_excel(SIMILARITY_FILE, header=None)
 
-        # Row 1 has the manufacturer names, data starts at row 2
-        # Columns: 0=unused, 1=DURATEX, 2=ARAUCO, 3=GUARARAPES, 4=EUCATEX,
-        #          5=PLACAS DO BRASIL, 6=FLORAPLAC, 7=BERNECK
-        manufacturer_cols = {}
-        for col_idx, brand in enumerate(MANUFACTURERS):
-            manufacturer_cols[col_idx + 1] = brand
+def _load_similarity_table(conn) -> dict:
+    """Insert similarity products + equivalences. The caller owns the transaction."""
+    # Read without headers — we'll parse manually
+    sheet_rows = _read_similarity_rows()
 
-        conn = get_connection()
-        products_created = 0
-        equivalences_created = 0
-        errors = []
-
-        # Process each data row (starting from row 3)
-        # Row 0 = empty, Row 1 = headers, Row 2 = manufacturer names, Row 3+ = data
-        for row_idx in range(3, len(df)):
-            row = df.iloc[row_idx]
-
-            # Collect valid products on this row
-            row_products = []  # list of (brand, product_name)
-            for col_idx, brand in manufacturer_cols.items():
-                cell_value = row.iloc[col_idx] if col_idx < len(row) else None
-                if pd.notna(cell_value) and str(cell_value).strip():
-                    product_name = str(cell_value).strip()
-                    row_products.append((brand, product_name))
-
-            # Insert products into the database
-            product_ids = []  # list of (product_id, brand, product_name)
-            for brand, product_name in row_products:
-                product_id = _ensure_product(conn, brand, product_name)
-                if product_id:
-                    product_ids.append(product_id)
-                    products_created += 1
+    # Row 1 has the manufacturer names, data starts at row 2
+    # Columns: 0=unused, 1=DURATEX, 2=ARAUCO, 3=GUARARAPES, 4=EUCATEX,
+    #          5=PLACAS DO BRASIL, 6=FLORAPLAC, 7=BERNECK
+    manufacturer_cols = {}
+    for col_idx, brand in enumerate(MANUFACTURERS):
+        manufacturer_cols[col_idx + 1] = brand
 
-            # Create equivalence pairs for all combinations on this row
-            for i in range(len(product_ids)):
-                for j in range(i + 1, len(product_ids)):
-                    id_a = min(product_ids[i], product_ids[j])
-                    id_b = max(product_ids[i], product_ids[j])
-                    try:
-                        conn.execute(
-                            """INSERT OR IGNORE INTO direct_equivalences
-                               (product_id_a, product_id_b, equivalence_source, confidence)
-                               VALUES (?, ?, ?, ?)""",
-                            (id_a, id_b, "Tabela Similaridade Grupo Locatelli", 1.0),
-                        )
-                        equivalences_created += 1
-                    except Exception as e:
-                        errors.append(f"Equivalence {id_a}-{id_b}: {str(e)}")
-
-        conn.commit()
-
-        # Log the import
-        log_import(
-            "PRELOAD_SIMILARITY_TABLE",
-            "preload",
-            products_created,
-            len(errors),
-            "success" if not errors else "partial",
-            "; ".join(errors[:5]) if errors else None,
+    products_created = 0
+    errors = []
+    equivalence_rows = []
+    code_cache = _build_code_cache(conn)
+    row_codes = []  # product codes per spreadsheet row
+    new_products = {}  # product_code -> INSERT params, first occurrence wins
+
+    # Pass 1: collect each row's product codes and the products still missing
+    # Row 0 = empty, Row 1 = headers, Row 2 = manufacturer names, Row 3+ = data
+    for row in sheet_rows[3:]:
+        # Collect valid products on this row
+        row_products = []  # list of (brand, product_name)
+        for col_idx, brand in manufacturer_cols.items():
+            cell_value = row[col_idx] if col_idx < len(row) else None
+            if cell_value is None:
+                continue
+            product_name = str(cell_value).strip()
+            if product_name:
+                row_products.append((brand, product_name))
+
+        codes = []
+        for brand, product_name in row_products:
+            product_code = _generate_product_code(brand, product_name)
+            if product_code not in code_cache and product_code not in new_products:
+                new_products[product_code] = (
+                    brand,
+                    product_name,
+                    product_code,
+                    _infer_category(product_name),
+                )
+            codes.append(product_code)
+        row_codes.append(codes)
+
+    # Pass 2: insert every missing product at once, then map the new codes
+    if new_products:
+        _chunked_insert(
+            conn,
+            """INSERT OR IGNORE INTO products
+               (brand, product_name, product_code, category, is_active)
+               VALUES """,
+            "(?, ?, ?, ?, 1)",
+            list(new_products.values()),
+        )
+        code_cache.update(_fetch_code_ids(conn, list(new_products)))
+
+    # Pass 3: equivalence pairs for all combinations on each row
+    for codes in row_codes:
+        product_ids = [code_cache[code] for code in codes if code in code_cache]
+        products_created += len(product_ids)
+
+        # Collect equivalence pairs for all combinations on this row;
+        # sorting once leaves every pair already ordered as (smaller, larger)
+        equivalence_rows.extend(
+            (id_a, id_b, "Tabela Similaridade Grupo Locatelli", 1.0)
+            for id_a, id_b in combinations(sorted(product_ids), 2)
         )
 
-        return {
-            "success": True,
-            "products_created": products_created,
-            "equivalences_created": equivalences_created,
-            "errors": errors,
-        }
+    _chunked_insert(
+        conn,
+        """INSERT OR IGNORE INTO direct_equivalences
+           (product_id_a, product_id_b, equivalence_source, confidence)
+           VALUES """,
+        "(?, ?, ?, ?)",
+        equivalence_rows,
+    )
 
-    except Exception as e:
-        log_import("PRELOAD_SIMILARITY_TABLE", "preload", 0, 0, "failed", str(e))
-        return {"success": False, "error": str(e)}
+    return {
+        "success": True,
+        "products_created": products_created,
+        "equivalences_created": len(equivalence_rows),
+        "errors": errors,
+    }
 
 
-def _ensure_product(conn, brand: str, product_name: str) -> int | None:
+def _read_similarity_rows() -> list:
     """
-    Ensure a product exists in the database. If it already exists, return its ID.
-    If not, create it and return the new ID.
+    Raw cell values of the similarity sheet, one sequence per row, empty cells as "".
 
-    Uses brand + product_name as the unique identifier.
-    product_code is auto-generated as BRAND_PRODUCTNAME (normalized).
+    With python-calamine installed the sheet is read directly, without building
+    a DataFrame; otherwise pandas reads it.
     """
-    # Generate a deterministic product_code
-    product_code = _generate_product_code(brand, product_name)
+    if EXCEL_ENGINE == "calamine":
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_path(str(SIMILARITY_FILE))
+        return workbook.get_sheet_by_index(0).to_python(skip_empty_area=False)
+
+    df = pd.read_excel(SIMILARITY_FILE, header=None, engine=EXCEL_ENGINE)
+    return df.fillna("").to_numpy(dtype=object).tolist()
+
+
+def _log_similarity_result(result: dict):
+    """Write the preload sentinel inside the caller's bulk_write transaction."""
+    errors = result["errors"]
+    log_import(
+        "PRELOAD_SIMILARITY_TABLE",
+        "preload",
+        result["products_created"],
+        len(errors),
+        "success" if not errors else "partial",
+        "; ".join(errors[:5]) if errors else None,
+        commit=False,
+    )
 
-    # Check if already exists
-    existing = conn.execute(
-        "SELECT id FROM products WHERE product_code = ?",
-        (product_code,),
-    ).fetchone()
 
-    if existing:
-        return existing["id"]
+def _build_code_cache(conn) -> dict[str, int]:
+    """Map every product_code to its id with one query."""
+    return {
+        row["product_code"]: row["id"]
+        for row in conn.execute("SELECT id, product_code FROM products")
+    }
 
-    # Create new product
-    try:
-        cursor = conn.execute(
-            """INSERT INTO products
-               (brand, product_name, product_code, category, is_active)
-               VALUES (?, ?, ?, ?, 1)""",
-            (brand, product_name, product_code, _infer_category(product_name)),
-        )
-        return cursor.lastrowid
-    except Exception:
-        return None
+
+def _fetch_code_ids(conn, codes: list[str], max_params: int = 999) -> dict[str, int]:
+    """Map the given product_codes to their ids, max_params codes per query."""
+    ids = {}
+    for start in range(0, len(codes), max_params):
+        batch = codes[start:start + max_params]
+        placeholders = ", ".join("?" * len(batch))
+        for row in conn.execute(
+            f"SELECT id, product_code FROM products WHERE product_code IN ({placeholders})",
+            batch,
+        ):
+            ids[row["product_code"]] = row["id"]
+    return ids
+
+
+# Product-code cleanup: one str.translate pass instead of chained replace()
+_CODE_BRAND_TABLE = str.maketrans({" ": None, "/": None})
+_CODE_NAME_TABLE = str.maketrans({" ": "_", "/": "_", ".": None, ",": None})
 
 
+@lru_cache(maxsize=8192)
 def _generate_product_code(brand: str, product_name: str) -> str:
     """Generate a unique product code from brand + name."""
     # Normalize: uppercase, remove special chars, replace spaces with underscore
-    brand_part = brand.upper().replace(" ", "").replace("/", "")[:6]
-    name_part = (
-        product_name.upper()
-        .replace(" ", "_")
-        .replace("/", "_")
-        .replace(".", "")
-        .replace(",", "")
-    )
+    brand_part = brand.upper().translate(_CODE_BRAND_TABLE)[:6]
+    name_part = product_name.upper().translate(_CODE_NAME_TABLE)
     return f"{brand_part}_{name_part}"
 
 
+# Category keywords, matched as substrings of the upper-cased product name
+_UNICOLOR_WORDS = (  # White/solid colors
+    "BRANCO", "PRETO", "CINZA", "TITANIO", "GRAFITE", "GRAFITO",
+    "AREIA", "BEIGE", "CREME", "MARFIM", "NEVE",
+)
+_MADEIRADO_WORDS = (  # Wood patterns
+    "CARVALHO", "NOGAL", "IMBUIA", "CEDAR", "CEDRO", "TECA", "TEKA",
+    "IPANEMA", "ITAPUA", "CANELA", "CASTANHO", "AMENDOA", "AMÊNDOA",
+    "FREIJO", "AMEIXA", "NOGUEIRA", "AVELA", "AVELÃ", "RUSTICO",
+    "ROVERE", "MONTANA", "HANOVER", "MELBOURNE", "DAMASCO",
+    "ACACIA", "SAVANA", "JATOBA", "JEQUITIBA", "LOURO",
+    "GENGIBRE", "LENHO", "PECAN", "CASTANHEIRA",
+    "AMENDOEIRA", "LAMINA", "NATURAL", "TREND",
+    "MADEIRA", "PINHO", "MAPLE", "OAK", "WALNUT",
+)
+_FANTASIA_WORDS = (  # Fantasy/textured
+    "TRAMA", "ESSENCIAL", "SILK", "LINHO", "CONCRETO", "BETON",
+    "CHESS", "CONNECT", "DIAMANTE", "SAGRADO", "DUNAS",
+    "FUME", "POENTE", "LUAR", "GIANDUIA", "CACAO",
+)
+# One alternation per category: a single scan instead of one `in` per word
+_CATEGORY_PATTERNS = tuple(
+    (category, re.compile("|".join(re.escape(w) for w in words)))
+    for category, words in (
+        ("unicolor", _UNICOLOR_WORDS),
+        ("madeirado", _MADEIRADO_WORDS),
+        ("fantasia", _FANTASIA_WORDS),
+    )
+)
+
+
+@lru_cache(maxsize=4096)
 def _infer_category(product_name: str) -> str:
     """Try to infer the MDF category from the product name."""
     name_upper = product_name.upper()
-
-    # White/solid colors
-    unicolor_words = [
-        "BRANCO", "PRETO", "CINZA", "TITANIO", "GRAFITE", "GRAFITO",
-        "AREIA", "BEIGE", "CREME", "MARFIM", "NEVE",
-    ]
-    if any(w in name_upper for w in unicolor_words):
-        return "unicolor"
-
-    # Wood patterns
-    madeirado_words = [
-        "CARVALHO", "NOGAL", "IMBUIA", "CEDAR", "CEDRO", "TECA", "TEKA",
-        "IPANEMA", "ITAPUA", "CANELA", "CASTANHO", "AMENDOA", "AMÊNDOA",
-        "FREIJO", "AMEIXA", "NOGUEIRA", "AVELA", "AVELÃ", "RUSTICO",
-        "ROVERE", "MONTANA", "HANOVER", "MELBOURNE", "DAMASCO",
-        "ACACIA", "SAVANA", "JATOBA", "JEQUITIBA", "LOURO",
-        "GENGIBRE", "LENHO", "PECAN", "CASTANHEIRA",
-        "AMENDOEIRA", "LAMINA", "NATURAL", "TREND",
-        "MADEIRA", "PINHO", "MAPLE", "OAK", "WALNUT",
-    ]
-    if any(w in name_upper for w in madeirado_words):
-        return "madeirado"
-
-    # Fantasy/textured
-    fantasia_words = [
-        "TRAMA", "ESSENCIAL", "SILK", "LINHO", "CONCRETO", "BETON",
-        "CHESS", "CONNECT", "DIAMANTE", "SAGRADO", "DUNAS",
-        "FUME", "POENTE", "LUAR", "GIANDUIA", "CACAO",
-    ]
-    if any(w in name_upper for w in fantasia_words):
-        return "fantasia"
-
+    for category, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(name_upper):
+            return category
     return "outro"
 
 
@@ -237,10 +350,10 @@ def is_stock_preloaded() -> bool:
     """Check if stock data was already imported."""
     conn = get_connection()
     row = conn.execute(
-        "SELECT COUNT(*) as cnt FROM import_log WHERE file_name = ? AND status IN ('success', 'partial')",
+        "SELECT 1 FROM import_log WHERE file_name = ? AND status IN ('success', 'partial') LIMIT 1",
         ("PRELOAD_STOCK",),
     ).fetchone()
-    return (row["cnt"] or 0) > 0
+    return row is not None
 
 
 def preload_stock() -> dict:
@@ -249,6 +362,31 @@ def preload_stock() -> dict:
     1) Primary store stock (STOCK_FILE) -> PRIMARY_LOCATION
     2) Central de Trocas (CENTRAL_STOCK_FILE) -> other locations (Empresa column)
     """
+    skipped = _check_stock_preload()
+    if skipped is not None:
+        return skipped
+
+    try:
+        conn = get_connection()
+        with bulk_write(conn, relax_sync=True):
+            # Another loader may have finished while we waited for the lock
+            skipped = _check_stock_preload()
+            if skipped is None:
+                result = _load_stock(conn)
+                _log_stock_result(result)
+    except Exception as e:
+        log_import("PRELOAD_STOCK", "stock", 0, 0, "failed", str(e))
+        return {"success": False, "error": str(e)}
+    if skipped is not None:
+        return skipped
+
+    invalidate_query_caches()
+    _clear_parse_caches()
+    return _trim_stock_result(result)
+
+
+def _check_stock_preload() -> dict | None:
+    """Return a result dict if the stock preload must not run, else None."""
     if not STOCK_FILE.exists():
         return {
             "success": False,
@@ -263,90 +401,186 @@ def preload_stock() -> dict:
 
     if is_stock_preloaded():
         return {"success": True, "message": "Estoque ja carregado anteriormente."}
+    return None
 
-    try:
-        conn = get_connection()
-        products_created = 0
-        products_updated = 0
-        stock_entries = 0
-        tapes_created = 0
-        errors = []
-        warnings = []
-
-        # Primary store stock (Fortaleza)
-        primary_result = _preload_stock_file(
+
+def _load_stock(conn) -> dict:
+    """Import both stock files. The caller owns the transaction."""
+    products_created = 0
+    products_updated = 0
+    stock_entries = 0
+    tapes_created = 0
+    errors = []
+    warnings = []
+    # Shared by both files; each file adds the products it created or updated
+    brand_cache = _build_brand_cache(conn)
+
+    # Primary store stock (Fortaleza)
+    primary_result = _preload_stock_file(
+        conn,
+        STOCK_FILE,
+        brand_cache=brand_cache,
+        default_location=PRIMARY_LOCATION,
+        use_location_column=False,
+        allow_tapes=True,
+        update_product_code=True,
+        skip_locations=None,
+    )
+    products_created += primary_result["products_created"]
+    products_updated += primary_result["products_updated"]
+    stock_entries += primary_result["stock_entries"]
+    tapes_created += primary_result["tapes_created"]
+    errors.extend(primary_result["errors"])
+    warnings.extend(primary_result["warnings"])
+
+    # Central de Trocas (other stores)
+    if CENTRAL_STOCK_FILE.exists():
+        central_result = _preload_stock_file(
             conn,
-            STOCK_FILE,
-            default_location=PRIMARY_LOCATION,
-            use_location_column=False,
-            allow_tapes=True,
-            update_product_code=True,
-            skip_locations=None,
+            CENTRAL_STOCK_FILE,
+            brand_cache=brand_cache,
+            default_location=None,
+            use_location_column=True,
+            allow_tapes=False,
+            update_product_code=False,
+            skip_locations={PRIMARY_LOCATION},
+        )
+        products_created += central_result["products_created"]
+        products_updated += central_result["products_updated"]
+        stock_entries += central_result["stock_entries"]
+        tapes_created += central_result["tapes_created"]
+        errors.extend(central_result["errors"])
+        warnings.extend(central_result["warnings"])
+    elif not CENTRAL_STOCK_REQUIRED:
+        warnings.append(
+            f"Central de Trocas nao encontrado: {CENTRAL_STOCK_FILE}"
         )
-        products_created += primary_result["products_created"]
-        products_updated += primary_result["products_updated"]
-        stock_entries += primary_result["stock_entries"]
-        tapes_created += primary_result["tapes_created"]
-        errors.extend(primary_result["errors"])
-        warnings.extend(primary_result["warnings"])
-
-        # Central de Trocas (other stores)
-        if CENTRAL_STOCK_FILE.exists():
-            central_result = _preload_stock_file(
-                conn,
-                CENTRAL_STOCK_FILE,
-                default_location=None,
-                use_location_column=True,
-                allow_tapes=False,
-                update_product_code=False,
-                skip_locations={PRIMARY_LOCATION},
-            )
-            products_created += central_result["products_created"]
-            products_updated += central_result["products_updated"]
-            stock_entries += central_result["stock_entries"]
-            tapes_created += central_result["tapes_created"]
-            errors.extend(central_result["errors"])
-            warnings.extend(central_result["warnings"])
-        elif not CENTRAL_STOCK_REQUIRED:
-            warnings.append(
-                f"Central de Trocas nao encontrado: {CENTRAL_STOCK_FILE}"
-            )
 
-        conn.commit()
+    return {
+        "success": True,
+        "products_created": products_created,
+        "products_updated": products_updated,
+        "stock_entries": stock_entries,
+        "tapes_created": tapes_created,
+        "errors": errors,
+        "warnings": warnings,
+    }
 
-        status = "success" if not errors else "partial"
-        log_import(
-            "PRELOAD_STOCK",
-            "stock",
-            stock_entries + tapes_created,
-            len(errors),
-            status,
-            "; ".join(errors[:5]) if errors else None,
-        )
 
-        return {
-            "success": True,
-            "products_created": products_created,
-            "products_updated": products_updated,
-            "stock_entries": stock_entries,
-            "tapes_created": tapes_created,
-            "errors": errors[:10],
-            "warnings": warnings[:10],
-        }
+def _log_stock_result(result: dict):
+    """Write the preload sentinel inside the caller's bulk_write transaction."""
+    errors = result["errors"]
+    log_import(
+        "PRELOAD_STOCK",
+        "stock",
+        result["stock_entries"] + result["tapes_created"],
+        len(errors),
+        "success" if not errors else "partial",
+        "; ".join(errors[:5]) if errors else None,
+        commit=False,
+    )
+
+
+def _trim_stock_result(result: dict) -> dict:
+    return {**result, "errors": result["errors"][:10], "warnings": result["warnings"][:10]}
+
+
+# ── Combined Preload ──────────────────────────────────────────
 
+def preload_all() -> dict:
+    """
+    Run whichever bundled preloads are still pending (similarity table,
+    then stock) in a single transaction, together with their import_log
+    sentinels, so concurrent callers never load the same part twice.
+
+    Returns {"similarity": {...}, "stock": {...}} with the same per-part
+    dicts that preload_similarity_table() / preload_stock() return.
+    """
+    results = {
+        "similarity": _check_similarity_preload(),
+        "stock": _check_stock_preload(),
+    }
+    pending = [name for name, result in results.items() if result is None]
+    if not pending:
+        return results
+
+    checks = {"similarity": _check_similarity_preload, "stock": _check_stock_preload}
+    try:
+        conn = get_connection()
+        with bulk_write(conn, relax_sync=True):
+            # Re-check under the write lock: another loader may have finished
+            # while we waited, and its sentinels are now visible
+            for name in pending:
+                results[name] = checks[name]()
+            pending = [name for name in pending if results[name] is None]
+            if "similarity" in pending:
+                results["similarity"] = _load_similarity_table(conn)
+                _log_similarity_result(results["similarity"])
+            if "stock" in pending:
+                results["stock"] = _load_stock(conn)
+                _log_stock_result(results["stock"])
     except Exception as e:
-        log_import("PRELOAD_STOCK", "stock", 0, 0, "failed", str(e))
-        return {"success": False, "error": str(e)}
+        # The whole transaction was rolled back, so every pending part failed
+        if "similarity" in pending:
+            log_import("PRELOAD_SIMILARITY_TABLE", "preload", 0, 0, "failed", str(e))
+        if "stock" in pending:
+            log_import("PRELOAD_STOCK", "stock", 0, 0, "failed", str(e))
+        for name in pending:
+            results[name] = {"success": False, "error": str(e)}
+        return results
+
+    if not pending:
+        return results
+
+    invalidate_query_caches()
+    _clear_parse_caches()
+    if "stock" in pending:
+        results["stock"] = _trim_stock_result(results["stock"])
+    return results
+
+
+# Accented letters found in Portuguese headers, mapped the way NFKD strips them
+_ACCENT_TABLE = str.maketrans(
+    "áàâãäéèêëíìîïóòôõöúùûüçñÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑ",
+    "aaaaaeeeeiiiiooooouuuucnAAAAAEEEEIIIIOOOOOUUUUCN",
+)
 
 
 def _normalize_col_name(name: str) -> str:
     """Normalize column name: remove accents, lowercase, strip."""
-    # Remove accents
-    nfkd = unicodedata.normalize("NFKD", str(name))
-    without_accents = "".join(c for c in nfkd if not unicodedata.combining(c))
+    text = str(name)
+    if text.isascii():
+        return text.lower().strip()
+    # Remove accents; anything the table does not cover goes through NFKD
+    without_accents = text.translate(_ACCENT_TABLE)
+    if not without_accents.isascii():
+        nfkd = unicodedata.normalize("NFKD", without_accents)
+        without_accents = "".join(c for c in nfkd if not unicodedata.combining(c))
     return without_accents.lower().strip()
 
 
+# Candidate (normalized) header names per stock-sheet field, in priority order
+_STOCK_COLUMNS = {
+    "code": ["codigo do produto", "codigo", "code"],
+    "name": ["produto", "product", "nome"],
+    "section": ["secao", "section"],
+    "brand": ["marca", "brand"],
+    "stock": ["saldo", "estoque", "stock", "quantidade"],
+    "price": ["preco venda", "preco", "price"],
+    "location": ["empresa", "localizacao", "location", "loja", "filial"],
+}
+
+
+def _is_stock_column(name) -> bool:
+    """usecols filter: True for any header _find_column could pick for a stock field."""
+    col = _normalize_col_name(name)
+    return any(
+        col.startswith(candidate) or candidate.startswith(col)
+        for candidates in _STOCK_COLUMNS.values()
+        for candidate in candidates
+    )
+
+
 def _find_column(df: pd.DataFrame, candidates: list[str]) -> str | None:
     """Find the first matching column from a list of candidates."""
     # First pass: exact match
@@ -364,17 +598,16 @@ def _find_column(df: pd.DataFrame, candidates: list[str]) -> str | None:
     return None
 
 
-def _parse_erp_code(value) -> str:
+def _parse_erp_codes(values: pd.Series) -> pd.Series:
     """Normalize ERP codes from Excel (supports numeric or composite codes)."""
-    if value is None or (hasattr(pd, "isna") and pd.isna(value)):
-        return ""
-    raw = str(value).strip()
-    if not raw:
-        return ""
+    codes = values.astype(str).str.strip()
     # Excel often stores codes as floats (e.g., 9978.0)
-    if re.fullmatch(r"\d+(?:\.0+)?", raw):
-        return str(int(float(raw)))
-    return raw
+    numeric = codes.str.fullmatch(_ERP_NUMERIC_RE.pattern)
+    if numeric.any():
+        # Drop the float tail and leading zeros as text: exact at any length
+        digits = codes[numeric].str.replace(r"\.0+$", "", regex=True).str.lstrip("0")
+        codes[numeric] = digits.where(digits != "", "0")
+    return codes.where(values.notna(), "")
 
 
 def _preload_stock_file(
@@ -385,22 +618,24 @@ def _preload_stock_file(
     allow_tapes: bool,
     update_product_code: bool,
     skip_locations: set[str] | None,
+    brand_cache: dict[str, dict] | None = None,
 ) -> dict:
     """Import stock data from a given file path with flexible location rules."""
-    df = pd.read_excel(file_path)
+    # ERP exports carry many unused columns; keep only the ones that could match
+    df = pd.read_excel(file_path, engine=EXCEL_ENGINE, usecols=_is_stock_column)
 
     # Normalize column names (handle encoding issues with accents)
     df.columns = [_normalize_col_name(c) for c in df.columns]
 
     # Identify columns
-    col_code = _find_column(df, ["codigo do produto", "codigo", "code"])
-    col_name = _find_column(df, ["produto", "product", "nome"])
-    col_section = _find_column(df, ["secao", "section"])
-    col_brand = _find_column(df, ["marca", "brand"])
-    col_stock = _find_column(df, ["saldo", "estoque", "stock", "quantidade"])
-    col_price = _find_column(df, ["preco venda", "preco", "price"])
+    col_code = _find_column(df, _STOCK_COLUMNS["code"])
+    col_name = _find_column(df, _STOCK_COLUMNS["name"])
+    col_section = _find_column(df, _STOCK_COLUMNS["section"])
+    col_brand = _find_column(df, _STOCK_COLUMNS["brand"])
+    col_stock = _find_column(df, _STOCK_COLUMNS["stock"])
+    col_price = _find_column(df, _STOCK_COLUMNS["price"])
     col_location = (
-        _find_column(df, ["empresa", "localizacao", "location", "loja", "filial"])
+        _find_column(df, _STOCK_COLUMNS["location"])
         if use_location_column
         else None
     )
@@ -426,45 +661,81 @@ def _preload_stock_file(
     tapes_created = 0
     errors = []
     warnings = []
-    brand_cache = _build_brand_cache(conn)
-
-    for _, row in df.iterrows():
-        product_name = "linha_desconhecida"
-        try:
-            product_name = str(row[col_name]).strip()
-            brand = str(row[col_brand]).strip().upper()
-            stock_qty = float(row[col_stock]) if pd.notna(row[col_stock]) else 0
-            erp_code = _parse_erp_code(row.get(col_code)) if col_code else ""
-            section = (
-                str(row[col_section]).strip()
-                if col_section and pd.notna(row.get(col_section))
+    stock_rows = []
+    if brand_cache is None:
+        brand_cache = _build_brand_cache(conn)
+    # Rows only match products that existed before this file; its own
+    # creations/updates are applied to the cache once the file is done
+    created_products = []
+    thickness_updates = {}
+
+    stock_numeric = pd.to_numeric(df[col_stock], errors="coerce")
+
+    # Normalize every field column-wise, then filter with masks, so the row
+    # loop below only parses names and writes to the database
+    rows = pd.DataFrame(
+        {
+            "product_name": df[col_name].astype(str).str.strip(),
+            "brand": df[col_brand].astype(str).str.strip().str.upper(),
+            "stock_qty": stock_numeric.fillna(0.0),
+            "erp_code": _parse_erp_codes(df[col_code]) if col_code else "",
+            "section": (
+                df[col_section].astype("string").str.strip().fillna("")
+                if col_section
                 else ""
-            )
-            price = (
-                float(row[col_price])
-                if col_price and pd.notna(row.get(col_price))
-                else None
-            )
-
-            location = default_location or PRIMARY_LOCATION
-            if col_location and pd.notna(row.get(col_location)):
-                location = str(row.get(col_location)).strip()
-            if skip_locations and location in skip_locations:
-                continue
+            ),
+            "price": (
+                pd.to_numeric(df[col_price], errors="coerce")
+                if col_price
+                else float("nan")
+            ),
+            "location": (
+                df[col_location].astype("string").str.strip()
+                .fillna(default_location or PRIMARY_LOCATION)
+                if col_location
+                else default_location or PRIMARY_LOCATION
+            ),
+        },
+        index=df.index,
+    )
 
-            # If we're not importing tapes, skip non-"Chapas" rows when section exists
-            if col_section and not allow_tapes:
-                section_value = section.lower()
-                if section_value and "chapa" not in section_value:
-                    continue
+    # Non-numeric stock/price cells are reported and skipped
+    bad_numbers = stock_numeric.isna() & df[col_stock].notna()
+    if col_price:
+        bad_numbers |= rows["price"].isna() & df[col_price].notna()
+    for product_name in rows.loc[bad_numbers, "product_name"]:
+        errors.append(f"{product_name}: saldo ou preco nao numerico")
+    keep = ~bad_numbers
+
+    if skip_locations:
+        keep &= ~rows["location"].isin(skip_locations)
+    section_lower = rows["section"].str.lower() if col_section else None
+    # If we're not importing tapes, skip non-"Chapas" rows when section exists
+    if col_section and not allow_tapes:
+        keep &= (section_lower == "") | section_lower.str.contains("chapa", regex=False)
+    is_tape = pd.Series(False, index=rows.index)
+    if col_section and allow_tapes:
+        is_tape = section_lower.str.contains("fita", regex=False) | section_lower.str.contains(
+            "acabamento", regex=False
+        )
+    rows["is_tape"] = is_tape
+    rows["brand_db"] = rows["brand"].replace(_BRAND_ALIASES)
+    rows["price"] = rows["price"].astype(object).where(rows["price"].notna(), None)
 
+    columns = [
+        "product_name", "brand", "brand_db", "stock_qty", "erp_code",
+        "price", "location", "is_tape",
+    ]
+    for (
+        product_name, brand, brand_db, stock_qty, erp_code, price, location, is_tape,
+    ) in rows.loc[keep, columns].itertuples(index=False, name=None):
+        try:
             # Parse product details from full name
             parsed = _parse_product_name(product_name, brand)
 
-            if allow_tapes and ("fita" in section.lower() or "acabamento" in section.lower()):
+            if is_tape:
                 # Import as edging tape
-                tape_id = _import_tape(conn, parsed, brand, erp_code, stock_qty)
-                if tape_id:
+                if _import_tape(conn, parsed, brand, erp_code, stock_qty):
                     tapes_created += 1
                 continue
 
@@ -472,7 +743,7 @@ def _preload_stock_file(
             existing_id = _match_existing_product(
                 conn,
                 parsed,
-                brand,
+                brand_db,
                 brand_cache=brand_cache,
             )
 
@@ -485,19 +756,34 @@ def _preload_stock_file(
                     price,
                     update_product_code=update_product_code,
                 )
-                _upsert_stock(conn, existing_id, stock_qty, location=location)
+                if parsed.get("thickness_mm"):
+                    thickness_updates[existing_id] = parsed["thickness_mm"]
+                stock_rows.append((existing_id, stock_qty, location))
                 products_updated += 1
                 stock_entries += 1
             else:
-                product_id = _create_stock_product(conn, parsed, brand, erp_code, price)
+                product_id = _create_stock_product(conn, parsed, brand_db, erp_code, price)
                 if product_id:
-                    _upsert_stock(conn, product_id, stock_qty, location=location)
+                    created_products.append(
+                        (
+                            brand_db,
+                            _match_entry(
+                                product_id,
+                                parsed["short_name"] or parsed["full_name"],
+                                parsed.get("thickness_mm"),
+                            ),
+                        )
+                    )
+                    stock_rows.append((product_id, stock_qty, location))
                     products_created += 1
                     stock_entries += 1
 
         except Exception as e:
             errors.append(f"{product_name}: {str(e)}")
 
+    _upsert_stock(conn, stock_rows)
+    _refresh_brand_cache(brand_cache, created_products, thickness_updates)
+
     return {
         "products_created": products_created,
         "products_updated": products_updated,
@@ -508,24 +794,69 @@ def _preload_stock_file(
     }
 
 
-def _build_brand_cache(conn) -> dict[str, list[dict]]:
-    """Build a cache of products by brand for faster matching."""
+def _build_brand_cache(conn, fold_brand_case: bool = True) -> dict[str, dict]:
+    """
+    Build a cache of products by brand for faster matching.
+
+    Each brand maps to {"by_name": {UPPER(name): [product, ...]},
+    "by_word": {word: {id, ...}}, "list": [product, ...]}: exact-name matches
+    are a dict hit, and fuzzy matching only compares word sets for products
+    that share at least one word with the stock name.
+
+    Brands are keyed upper-cased. With fold_brand_case=False they keep their
+    stored case, so lookups by the upper-cased brand behave like the
+    uncached `brand = ?` query and only match brands stored in upper case.
+    """
     rows = conn.execute(
         "SELECT id, brand, product_name, thickness_mm FROM products WHERE is_active = 1"
     ).fetchall()
-    cache: dict[str, list[dict]] = {}
+    cache: dict[str, dict] = {}
     for row in rows:
-        brand = str(row["brand"]).upper()
-        cache.setdefault(brand, []).append(
-            {
-                "id": row["id"],
-                "product_name": row["product_name"],
-                "thickness_mm": row["thickness_mm"],
-            }
+        brand = str(row["brand"])
+        _cache_product(
+            cache,
+            brand.upper() if fold_brand_case else brand,
+            _match_entry(row["id"], row["product_name"], row["thickness_mm"]),
         )
     return cache
 
 
+def _match_entry(product_id: int, product_name: str, thickness_mm: float | None) -> dict:
+    """Product dict for _match_existing_product, with its name keys precomputed."""
+    name_upper = str(product_name).upper()
+    return {
+        "id": product_id,
+        "product_name": product_name,
+        "thickness_mm": thickness_mm,
+        "name_upper": name_upper,
+        "words": set(name_upper.split()) - _STOPWORDS,
+    }
+
+
+def _cache_product(cache: dict[str, dict], brand: str, product: dict):
+    """Add one product dict to a brand cache built by _build_brand_cache, under the brand key as given."""
+    bucket = cache.setdefault(brand, {"by_name": {}, "by_word": {}, "list": []})
+    bucket["list"].append(product)
+    bucket["by_name"].setdefault(product["name_upper"], []).append(product)
+    for word in product["words"]:
+        bucket["by_word"].setdefault(word, set()).add(product["id"])
+
+
+def _refresh_brand_cache(
+    cache: dict[str, dict],
+    created: list[tuple[str, dict]],
+    thickness_updates: dict[int, float],
+):
+    """Apply the products created/updated while loading one stock file."""
+    if thickness_updates:
+        for bucket in cache.values():
+            for product in bucket["list"]:
+                if product["id"] in thickness_updates:
+                    product["thickness_mm"] = thickness_updates[product["id"]]
+    for brand, product in created:
+        _cache_product(cache, brand, product)
+
+
 def _parse_product_name(full_name: str, brand: str) -> dict:
     """
     Parse a detailed product name like 'Mdf Duratex Carvalho Hanover Design 15mm 2f'
@@ -533,6 +864,13 @@ def _parse_product_name(full_name: str, brand: str) -> dict:
 
     Returns dict with: short_name, thickness_mm, finish, faces, is_hydro, full_name
     """
+    # Stock sheets repeat names across locations; callers get their own dict
+    return dict(_parse_product_name_cached(full_name, brand))
+
+
+@lru_cache(maxsize=8192)
+def _parse_product_name_cached(full_name: str, brand: str) -> tuple:
+    """Memoized _parse_product_name, as an immutable tuple of (key, value) items."""
     result = {
         "full_name": full_name,
         "short_name": "",
@@ -543,32 +881,24 @@ def _parse_product_name(full_name: str, brand: str) -> dict:
     }
 
     name = full_name
+    name_lower = name.lower()
 
     # Detect hydro/ultra
-    if "hidro" in name.lower() or "ultra" in name.lower():
+    if "hidro" in name_lower or "ultra" in name_lower:
         result["is_hydro"] = True
 
     # Extract thickness (e.g., "15mm", "06mm")
-    thickness_match = re.search(r'(\d+(?:[.,]\d+)?)\s*mm', name, re.IGNORECASE)
+    thickness_match = _THICKNESS_RE.search(name)
     if thickness_match:
         result["thickness_mm"] = float(thickness_match.group(1).replace(",", "."))
 
     # Extract faces (e.g., "2f", "1f")
-    faces_match = re.search(r'(\d)\s*f\b', name, re.IGNORECASE)
+    faces_match = _FACES_RE.search(name)
     if faces_match:
         result["faces"] = int(faces_match.group(1))
 
     # Extract finish keywords
-    finish_keywords = [
-        "Design", "Silk", "Essencial", "Lacca", "Tx", "Matt",
-        "Supermatte", "Acetinatta", "Jateado", "Nature", "Natura",
-        "Pele", "Line", "Bold", "Chess", "Duna", "Trama",
-        "Orvalho", "Soft", "Liso",
-    ]
-    found_finishes = []
-    for keyword in finish_keywords:
-        if keyword.lower() in name.lower():
-            found_finishes.append(keyword)
+    found_finishes = [k for k, k_lower in _FINISH_KEYWORDS_LOWER if k_lower in name_lower]
     if found_finishes:
         result["finish"] = " ".join(found_finishes)
 
@@ -576,69 +906,74 @@ def _parse_product_name(full_name: str, brand: str) -> dict:
     short = name
 
     # Remove leading "Mdf", "Pvc", "Mdp", etc.
-    short = re.sub(r'^(Mdf|Mdp|Pvc|Bp|Hdf|Eucadur|Ripado)\s+', '', short, flags=re.IGNORECASE)
+    short = _MATERIAL_PREFIX_RE.sub('', short)
 
     # Remove brand name
-    brand_words = brand.upper().split()
-    for bw in brand_words:
-        short = re.sub(r'\b' + re.escape(bw) + r'\b', '', short, flags=re.IGNORECASE)
+    brand_re = _brand_words_re(brand.upper())
+    if brand_re is not None:
+        short = brand_re.sub('', short)
 
     # Remove thickness, faces, dimensions
-    short = re.sub(r'\d+(?:[.,]\d+)?\s*mm', '', short)
-    short = re.sub(r'\d+\s*f\b', '', short, flags=re.IGNORECASE)
-    short = re.sub(r'\d+[x,]\d+(?:[x,]\d+)?', '', short)  # dimensions like 2,75x1,85
+    short = _THICKNESS_STRIP_RE.sub('', short)
+    short = _FACES_STRIP_RE.sub('', short)
+    short = _DIMENSIONS_RE.sub('', short)
 
     # Remove parenthesized codes like (10088417)
-    short = re.sub(r'\([^)]*\)', '', short)
+    short = _PARENTHESIZED_RE.sub('', short)
 
     # Remove "Hidro/Ultra", "Avariado", "Cx \d+"
-    short = re.sub(r'Hidro/?Ultra', '', short, flags=re.IGNORECASE)
-    short = re.sub(r'Avariado', '', short, flags=re.IGNORECASE)
-    short = re.sub(r'Cx\s*\d+', '', short, flags=re.IGNORECASE)
+    short = _HYDRO_RE.sub('', short)
+    short = _DAMAGED_RE.sub('', short)
+    short = _BOX_RE.sub('', short)
 
     # Remove finish keywords for matching (keep the raw core name)
-    for keyword in finish_keywords:
-        short = re.sub(r'\b' + re.escape(keyword) + r'\b', '', short, flags=re.IGNORECASE)
+    short = _FINISH_WORDS_RE.sub('', short)
 
     # Clean up whitespace and dashes
-    short = re.sub(r'\s*-\s*', ' ', short)
-    short = re.sub(r'\s+', ' ', short).strip()
+    short = _DASH_RE.sub(' ', short)
+    short = _WHITESPACE_RE.sub(' ', short).strip()
 
     result["short_name"] = short.upper()
-    return result
+    return tuple(result.items())
+
+
+@lru_cache(maxsize=64)
+def _brand_words_re(brand_upper: str) -> re.Pattern | None:
+    """One whole-word pattern matching any word of the brand name."""
+    words = brand_upper.split()
+    if not words:
+        return None
+    return re.compile(
+        r'\b(?:' + '|'.join(re.escape(w) for w in words) + r')\b', re.IGNORECASE
+    )
 
 
 def _match_existing_product(
     conn,
     parsed: dict,
-    brand: str,
-    brand_cache: dict[str, list[dict]] | None = None,
+    brand_db: str,
+    brand_cache: dict[str, dict] | None = None,
+    fuzzy_thickness: bool = True,
 ) -> int | None:
     """
     Try to match a stock product with an existing product from the similarity table.
-    Uses the short_name extracted from the full product name.
+    Uses the short_name extracted from the full product name; brand_db is
+    the brand as stored in products (see _db_brand). With
+    fuzzy_thickness=False the containment/word-overlap strategy ignores
+    thickness, as the uncached lookup (which never loads it) always does.
     """
     short_name = parsed["short_name"]
     if not short_name:
         return None
 
-    # Normalize brand for comparison
-    brand_upper = brand.upper()
-    brand_map = {
-        "PLACAS DO BRASIL": "PLACAS DO BRASIL",
-        "PLACAS": "PLACAS DO BRASIL",
-    }
-    brand_db = brand_map.get(brand_upper, brand_upper)
-
     # Strategy 1: Exact match on brand + product_name
+    bucket = brand_cache.get(brand_db) if brand_cache is not None else None
     if brand_cache is not None:
-        for candidate in brand_cache.get(brand_db, []):
-            if str(candidate["product_name"]).upper() == short_name:
-                candidate_thickness = candidate.get("thickness_mm")
-                parsed_thickness = parsed.get("thickness_mm")
-                if _thickness_conflicts(parsed_thickness, candidate_thickness):
-                    continue
-                return candidate["id"]
+        exact = bucket["by_name"].get(short_name, []) if bucket else []
+        for candidate in exact:
+            if _thickness_conflicts(parsed.get("thickness_mm"), candidate["thickness_mm"]):
+                continue
+            return candidate["id"]
     else:
         existing = conn.execute(
             "SELECT id, thickness_mm FROM products WHERE brand = ? AND UPPER(product_name) = ? AND is_active = 1",
@@ -651,31 +986,37 @@ def _match_existing_product(
     # Strategy 2: Check if the short_name CONTAINS the product_name or vice versa
     # e.g., stock "CARVALHO HANOVER" matches similarity table "CARVALHO HANOVER"
     if brand_cache is not None:
-        candidates = brand_cache.get(brand_db, [])
+        candidates = bucket["list"] if bucket else []
     else:
-        candidates = conn.execute(
-            "SELECT id, product_name FROM products WHERE brand = ? AND is_active = 1",
-            (brand_db,),
-        ).fetchall()
-
+        candidates = [
+            _match_entry(row["id"], row["product_name"], None)
+            for row in conn.execute(
+                "SELECT id, product_name FROM products WHERE brand = ? AND is_active = 1",
+                (brand_db,),
+            )
+        ]
+
+    short_words = set(short_name.split()) - _STOPWORDS
+    # Products sharing no word with short_name can only match by containment
+    if bucket is not None:
+        word_hits = set()
+        for word in short_words:
+            word_hits |= bucket["by_word"].get(word, set())
+    else:
+        word_hits = None
+    parsed_thickness = parsed.get("thickness_mm") if fuzzy_thickness else None
     for candidate in candidates:
-        candidate_name = str(candidate["product_name"]).upper()
-        candidate_thickness = candidate.get("thickness_mm") if isinstance(candidate, dict) else None
-        if candidate_thickness is None and not isinstance(candidate, dict):
-            try:
-                candidate_thickness = candidate["thickness_mm"]
-            except Exception:
-                candidate_thickness = None
-        parsed_thickness = parsed.get("thickness_mm")
-        if _thickness_conflicts(parsed_thickness, candidate_thickness):
+        if _thickness_conflicts(parsed_thickness, candidate["thickness_mm"]):
             continue
+        candidate_name = candidate["name_upper"]
         # Check if one name contains the other
         if candidate_name in short_name or short_name in candidate_name:
             return candidate["id"]
+        if word_hits is not None and candidate["id"] not in word_hits:
+            continue
 
         # Check word overlap (at least 2 meaningful words match)
-        short_words = set(short_name.split()) - {"DE", "DO", "DA", "E", "COM", "EM"}
-        candidate_words = set(candidate_name.split()) - {"DE", "DO", "DA", "E", "COM", "EM"}
+        candidate_words = candidate["words"]
         common = short_words & candidate_words
         if len(common) >= 2:
             return candidate["id"]
@@ -686,6 +1027,12 @@ def _match_existing_product(
     return None
 
 
+def _db_brand(brand: str) -> str:
+    """Normalize a stock-sheet brand to the name used in the products table."""
+    brand_upper = brand.upper()
+    return _BRAND_ALIASES.get(brand_upper, brand_upper)
+
+
 def _thickness_conflicts(
     parsed_thickness: float | None,
     candidate_thickness: float | None,
@@ -731,41 +1078,47 @@ def _update_product_details(
         )
 
 
-def _upsert_stock(
+def _upsert_stock(conn, rows: list[tuple]):
+    """Insert or update (product_id, quantity, location) stock entries."""
+    _chunked_insert(
+        conn,
+        """INSERT INTO stock
+           (product_id, quantity_available, quantity_reserved, location, last_updated)
+           VALUES """,
+        "(?, ?, 0, ?, CURRENT_TIMESTAMP)",
+        rows,
+        suffix="""
+           ON CONFLICT(product_id, location) DO UPDATE SET
+               quantity_available = excluded.quantity_available,
+               last_updated = CURRENT_TIMESTAMP""",
+    )
+
+
+def _chunked_insert(
     conn,
-    product_id: int,
-    quantity: float,
-    location: str = PRIMARY_LOCATION,
+    prefix: str,
+    placeholder: str,
+    rows: list[tuple],
+    suffix: str = "",
+    max_params: int = 999,
 ):
-    """Insert or update stock entry for a product."""
-    existing = conn.execute(
-        "SELECT id FROM stock WHERE product_id = ? AND location = ?",
-        (product_id, location),
-    ).fetchone()
+    """
+    Insert rows with multi-row VALUES statements.
 
-    if existing:
-        conn.execute(
-            """UPDATE stock SET quantity_available = ?, last_updated = CURRENT_TIMESTAMP
-               WHERE product_id = ? AND location = ?""",
-            (quantity, product_id, location),
-        )
-    else:
+    Each statement carries as many rows as fit in SQLite's default bound
+    parameter limit, so the VM is prepared once per chunk instead of once per row.
+    """
+    step = max(1, max_params // placeholder.count("?"))
+    for start in range(0, len(rows), step):
+        batch = rows[start:start + step]
         conn.execute(
-            """INSERT INTO stock
-               (product_id, quantity_available, quantity_reserved, location, last_updated)
-               VALUES (?, ?, 0, ?, CURRENT_TIMESTAMP)""",
-            (product_id, quantity, location),
+            prefix + ", ".join([placeholder] * len(batch)) + suffix,
+            [value for row in batch for value in row],
         )
 
 
-def _create_stock_product(conn, parsed: dict, brand: str, erp_code: str, price: float | None) -> int | None:
-    """Create a new product from stock data."""
-    brand_upper = brand.upper()
-    brand_map = {
-        "PLACAS DO BRASIL": "PLACAS DO BRASIL",
-        "PLACAS": "PLACAS DO BRASIL",
-    }
-    brand_db = brand_map.get(brand_upper, brand_upper)
+def _create_stock_product(conn, parsed: dict, brand_db: str, erp_code: str, price: float | None) -> int | None:
+    """Create a new product from stock data. brand_db is already normalized (_db_brand)."""
 
     product_code = erp_code if erp_code else _generate_product_code(brand_db, parsed["short_name"])
 
@@ -789,50 +1142,34 @@ def _create_stock_product(conn, parsed: dict, brand: str, erp_code: str, price:
         return None
 
 
-def _import_tape(conn, parsed: dict, brand: str, erp_code: str, stock_qty: float) -> int | None:
-    """Import an edging tape product."""
+def _import_tape(conn, parsed: dict, brand: str, erp_code: str, stock_qty: float) -> bool:
+    """Insert or update an edging tape product. Returns True when written."""
     brand_upper = brand.upper()
     tape_name = parsed["short_name"] or parsed["full_name"]
     tape_code = erp_code if erp_code else _generate_product_code(brand_upper, tape_name)
 
     # Parse width from name (e.g., "22x0,45mm")
-    width_match = re.search(r'(\d+)\s*x\s*\d', parsed["full_name"])
+    width_match = _TAPE_WIDTH_RE.search(parsed["full_name"])
     width_mm = float(width_match.group(1)) if width_match else None
 
     # Parse thickness from name
-    thickness_match = re.search(r'x\s*(\d+[.,]\d+)\s*mm', parsed["full_name"])
+    thickness_match = _TAPE_THICKNESS_RE.search(parsed["full_name"])
     tape_thickness = float(thickness_match.group(1).replace(",", ".")) if thickness_match else None
 
     try:
-        existing = conn.execute(
-            "SELECT id FROM edging_tapes WHERE tape_code = ?",
-            (tape_code,),
-        ).fetchone()
-
-        if existing:
-            conn.execute(
-                """UPDATE edging_tapes
-                   SET brand = ?, tape_name = ?, width_mm = ?, thickness_mm = ?,
-                       finish = ?, color_family = ?, quantity_available = ?
-                   WHERE id = ?""",
-                (
-                    brand_upper,
-                    tape_name,
-                    width_mm,
-                    tape_thickness,
-                    parsed.get("finish"),
-                    _infer_category(tape_name),
-                    stock_qty,
-                    existing["id"],
-                ),
-            )
-            return existing["id"]
-
-        cursor = conn.execute(
+        conn.execute(
             """INSERT INTO edging_tapes
                (brand, tape_name, tape_code, width_mm, thickness_mm,
                 finish, color_family, quantity_available)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(tape_code) DO UPDATE SET
+                   brand = excluded.brand,
+                   tape_name = excluded.tape_name,
+                   width_mm = excluded.width_mm,
+                   thickness_mm = excluded.thickness_mm,
+                   finish = excluded.finish,
+                   color_family = excluded.color_family,
+                   quantity_available = excluded.quantity_available""",
             (
                 brand_upper,
                 tape_name,
@@ -844,6 +1181,6 @@ def _import_tape(conn, parsed: dict, brand: str, erp_code: str, stock_qty: float
                 stock_qty,
             ),
         )
-        return cursor.lastrowid if cursor.lastrowid else None
+        return True
     except Exception:
-        return None
+        return False
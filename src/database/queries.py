@@ -1,6 +1,9 @@
 """Parameterized query functions for database operations."""
 
 import sqlite3
+import threading
+import time
+from functools import lru_cache
 from typing import Optional
 from src.database.connection import get_connection
 from config.settings import PRIMARY_LOCATION
@@ -15,6 +18,12 @@ def get_product_by_id(product_id: int) -> Optional[sqlite3.Row]:
     ).fetchone()
 
 
+@lru_cache(maxsize=2048)
+def get_product_by_id_cached(product_id: int) -> Optional[sqlite3.Row]:
+    """Memoized get_product_by_id for read paths; see invalidate_query_caches()."""
+    return get_product_by_id(product_id)
+
+
 def get_product_by_code(product_code: str) -> Optional[sqlite3.Row]:
     conn = get_connection()
     return conn.execute(
@@ -179,6 +188,47 @@ def get_compatible_tapes(product_id: int) -> list[sqlite3.Row]:
     ).fetchall()
 
 
+def get_first_compatible_tape(product_id: int) -> Optional[sqlite3.Row]:
+    """Best-ranked compatible tape only (same ordering as get_compatible_tapes)."""
+    conn = get_connection()
+    return conn.execute(
+        """SELECT et.*, tpc.compatibility_type
+           FROM tape_product_compatibility tpc
+           JOIN edging_tapes et ON tpc.tape_id = et.id
+           WHERE tpc.product_id = ? AND et.is_active = 1
+           ORDER BY
+               CASE tpc.compatibility_type
+                   WHEN 'official' THEN 1
+                   WHEN 'recommended' THEN 2
+                   WHEN 'alternative' THEN 3
+               END
+           LIMIT 1""",
+        (product_id,),
+    ).fetchone()
+
+
+_TAPE_CACHE_TTL_SECONDS = 30
+_TAPE_CACHE_MAX_ENTRIES = 512
+_tape_cache: dict[int, tuple[float, list[sqlite3.Row]]] = {}
+_tape_cache_lock = threading.Lock()
+
+
+def get_compatible_tapes_cached(product_id: int) -> list[sqlite3.Row]:
+    """get_compatible_tapes with a short TTL, since tape stock changes on import."""
+    now = time.monotonic()
+    with _tape_cache_lock:
+        hit = _tape_cache.get(product_id)
+        if hit and now - hit[0] < _TAPE_CACHE_TTL_SECONDS:
+            return hit[1]
+
+    rows = get_compatible_tapes(product_id)
+    with _tape_cache_lock:
+        if len(_tape_cache) >= _TAPE_CACHE_MAX_ENTRIES:
+            _tape_cache.clear()
+        _tape_cache[product_id] = (now, rows)
+    return rows
+
+
 def get_tape_equivalents(tape_id: int) -> list[sqlite3.Row]:
     conn = get_connection()
     return conn.execute(
@@ -312,7 +362,9 @@ def get_feedback_stats() -> dict:
 # ── Import Log ───────────────────────────────────────────
 
 def log_import(file_name: str, file_type: str, rows_imported: int,
-               rows_failed: int, status: str, error_message: str = None) -> int:
+               rows_failed: int, status: str, error_message: str = None,
+               commit: bool = True) -> int:
+    """Record an import run; commit=False leaves it in the caller's open transaction."""
     conn = get_connection()
     cursor = conn.execute(
         """INSERT INTO import_log
@@ -320,5 +372,15 @@ def log_import(file_name: str, file_type: str, rows_imported: int,
            VALUES (?, ?, ?, ?, ?, ?)""",
         (file_name, file_type, rows_imported, rows_failed, status, error_message),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
     return cursor.lastrowid
+
+
+# ── Cache Invalidation ───────────────────────────────────
+
+def invalidate_query_caches():
+    """Drop memoized product/tape lookups. Call after writing products or tapes."""
+    get_product_by_id_cached.cache_clear()
+    with _tape_cache_lock:
+        _tape_cache.clear()
@@ -130,8 +130,8 @@ INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_products_code ON products(product_code)",
     "CREATE INDEX IF NOT EXISTS idx_products_name ON products(product_name)",
     "CREATE INDEX IF NOT EXISTS idx_products_category ON products(category)",
+    "CREATE INDEX IF NOT EXISTS idx_products_brand_upper_name ON products(brand, UPPER(product_name))",
     "CREATE INDEX IF NOT EXISTS idx_stock_product ON stock(product_id)",
-    "CREATE INDEX IF NOT EXISTS idx_stock_product_location ON stock(product_id, location)",
     "CREATE INDEX IF NOT EXISTS idx_equivalences_a ON direct_equivalences(product_id_a)",
     "CREATE INDEX IF NOT EXISTS idx_equivalences_b ON direct_equivalences(product_id_b)",
     "CREATE INDEX IF NOT EXISTS idx_tape_compat_product ON tape_product_compatibility(product_id)",
@@ -139,6 +139,7 @@ INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_similarity_a ON similarity_cache(product_id_a)",
     "CREATE INDEX IF NOT EXISTS idx_similarity_b ON similarity_cache(product_id_b)",
     "CREATE INDEX IF NOT EXISTS idx_feedback_original ON feedback(original_product_id)",
+    "CREATE INDEX IF NOT EXISTS idx_import_log_file ON import_log(file_name, status)",
 ]
 
 
@@ -151,7 +152,10 @@ def initialize_database():
     for index_sql in INDEXES:
         cursor.execute(index_sql)
     _ensure_column(conn, "edging_tapes", "quantity_available", "REAL DEFAULT 0")
+    _ensure_unique_stock_location(conn)
     conn.commit()
+    # Refresh planner statistics where the schema or data changed enough
+    conn.execute("PRAGMA optimize")
 
 
 def _ensure_column(conn, table: str, column: str, ddl: str):
@@ -160,3 +164,32 @@ def _ensure_column(conn, table: str, column: str, ddl: str):
     existing = {row["name"] for row in cols}
     if column not in existing:
         conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+def _ensure_unique_stock_location(conn):
+    """
+    Make (product_id, location) unique in stock so imports can upsert with
+    ON CONFLICT. Older databases may hold duplicate rows; keep the most
+    recent one per pair before creating the index (lightweight migration).
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_stock_product_location'"
+    ).fetchone()
+    if exists:
+        return
+    conn.execute(
+        """DELETE FROM stock WHERE id IN (
+               SELECT id FROM (
+                   SELECT id, ROW_NUMBER() OVER (
+                       PARTITION BY product_id, location
+                       ORDER BY last_updated DESC, id DESC
+                   ) AS rn
+                   FROM stock
+               )
+               WHERE rn > 1
+           )"""
+    )
+    conn.execute("DROP INDEX IF EXISTS idx_stock_product_location")
+    conn.execute(
+        "CREATE UNIQUE INDEX ux_stock_product_location ON stock(product_id, location)"
+    )
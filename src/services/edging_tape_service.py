@@ -13,12 +13,12 @@ def find_compatible(product_id: int) -> list[dict]:
     Falls back to name-based matching if no official compatibility exists.
     """
     # Strategy 1: Official compatibility
-    rows = queries.get_compatible_tapes(product_id)
+    rows = queries.get_compatible_tapes_cached(product_id)
     if rows:
         return _decorate_tapes([dict(row) for row in rows])
 
     # Strategy 2: Fallback - match by name
-    product = queries.get_product_by_id(product_id)
+    product = queries.get_product_by_id_cached(product_id)
     if not product:
         return []
 
@@ -83,6 +83,22 @@ def find_tape_for_substitute(
     return orig_tapes
 
 
+def find_first_tape_for_substitute(
+    original_product_id: int,
+    substitute_product_id: int,
+) -> dict | None:
+    """
+    Top tape from find_tape_for_substitute, fetching a single row when the
+    substitute has an official compatibility entry.
+    """
+    row = queries.get_first_compatible_tape(substitute_product_id)
+    if row:
+        return _decorate_tapes([dict(row)])[0]
+
+    tapes = find_tape_for_substitute(original_product_id, substitute_product_id)
+    return tapes[0] if tapes else None
+
+
 def _compute_match_score(product_name: str, tape: dict) -> float:
     """Compute a fuzzy match score between product and tape names."""
     norm_query = normalize_text(product_name)
@@ -17,7 +17,7 @@ def find_direct_equivalents(
     if not rows:
         return []
 
-    original = queries.get_product_by_id(product_id)
+    original = queries.get_product_by_id_cached(product_id)
     original_thickness = original["thickness_mm"] if original else None
 
     results = []
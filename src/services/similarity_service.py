@@ -5,9 +5,9 @@ import json
 from pathlib import Path
 from urllib.parse import urlparse
 
-import anthropic
 import requests as http_requests
 
+from src.ai.claude_client import get_anthropic_client
 from src.database import queries
 from config.settings import (
     CLAUDE_API_KEY,
@@ -49,7 +49,7 @@ def find_visual_alternatives(
             return results[:max_results]
 
     # No cache — call Claude Vision
-    original = queries.get_product_by_id(product_id)
+    original = queries.get_product_by_id_cached(product_id)
     if not original:
         return []
 
@@ -239,7 +239,7 @@ def _analyze_batch_with_vision(
     if not CLAUDE_API_KEY:
         return []
 
-    client = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
+    client = get_anthropic_client(CLAUDE_API_KEY)
 
     # Build content with images
     content = [
@@ -334,7 +334,7 @@ def _compare_uploaded_image_with_batch(
     if not CLAUDE_API_KEY:
         return []
 
-    client = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
+    client = get_anthropic_client(CLAUDE_API_KEY)
 
     content = [
         {
@@ -2,11 +2,13 @@
 
 import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 from src.ai.claude_client import ClaudeClient
 from src.ai.prompts import SYSTEM_PROMPT
 from src.ai.tools import TOOLS
 from src.ai.response_formatter import generate_client_text
+from src.database.connection import close_connection, get_connection
 from src.services import (
     product_service,
     stock_service,
@@ -17,6 +19,9 @@ from src.services import (
     feedback_service,
 )
 
+# Upper bound on tool handlers run concurrently within one assistant turn
+MAX_PARALLEL_TOOLS = 4
+
 
 class SubstitutionOrchestrator:
     def __init__(self, api_key: str = None):
@@ -106,33 +111,33 @@ class SubstitutionOrchestrator:
                 {"role": "assistant", "content": response.content}
             )
 
-            tool_results = []
-            for tool_block in tool_use_blocks:
-                # Notify UI about which tool is being called
-                if on_tool_call:
+            # Notify UI about which tools are being called
+            if on_tool_call:
+                for tool_block in tool_use_blocks:
                     try:
                         on_tool_call(tool_block.name)
                     except Exception:
                         pass
 
-                handler = self.tool_handlers.get(tool_block.name)
-                if handler:
-                    try:
-                        result = handler(**tool_block.input)
-                    except Exception as e:
-                        result = {"error": str(e)}
-                else:
-                    result = {"error": f"Ferramenta desconhecida: {tool_block.name}"}
+            # Tools requested in the same turn are independent (DB lookups,
+            # web/vision HTTP calls), so run them concurrently.
+            if len(tool_use_blocks) > 1:
+                workers = min(len(tool_use_blocks), MAX_PARALLEL_TOOLS)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(self._run_tool_on_worker, tool_use_blocks))
+            else:
+                results = [self._run_tool(tool_use_blocks[0])]
 
-                tool_results.append(
-                    {
-                        "type": "tool_result",
-                        "tool_use_id": tool_block.id,
-                        "content": json.dumps(
-                            result, ensure_ascii=False, default=str
-                        ),
-                    }
-                )
+            tool_results = [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": tool_block.id,
+                    "content": json.dumps(
+                        result, ensure_ascii=False, default=str
+                    ),
+                }
+                for tool_block, result in zip(tool_use_blocks, results)
+            ]
 
             conversation_history.append({"role": "user", "content": tool_results})
 
@@ -144,6 +149,24 @@ class SubstitutionOrchestrator:
             conversation_history,
         )
 
+    def _run_tool(self, tool_block) -> dict | list:
+        """Dispatch one tool_use block to its handler, capturing errors."""
+        handler = self.tool_handlers.get(tool_block.name)
+        if not handler:
+            return {"error": f"Ferramenta desconhecida: {tool_block.name}"}
+        try:
+            return handler(**tool_block.input)
+        except Exception as e:
+            return {"error": str(e)}
+
+    def _run_tool_on_worker(self, tool_block) -> dict | list:
+        """_run_tool for a per-turn pool thread, on its own SQLite connection."""
+        get_connection(dedicated=True)
+        try:
+            return self._run_tool(tool_block)
+        finally:
+            close_connection()
+
     # ── Tool Handlers ────────────────────────────────────
 
     def _handle_search_product(self, query: str) -> list[dict]:
@@ -2,6 +2,11 @@
 
 import re
 import unicodedata
+from functools import lru_cache
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_COLUMN_CHARS_RE = re.compile(r"[^a-z0-9_]")
+_COLUMN_SEPARATORS = str.maketrans({" ": "_", "-": "_"})
 
 
 def normalize_text(text: str) -> str:
@@ -11,13 +16,12 @@ def normalize_text(text: str) -> str:
     text = text.strip().lower()
     text = unicodedata.normalize("NFKD", text)
     text = "".join(c for c in text if not unicodedata.combining(c))
-    text = re.sub(r"\s+", " ", text)
+    text = _WHITESPACE_RE.sub(" ", text)
     return text
 
 
+@lru_cache(maxsize=4096)
 def normalize_column_name(col: str) -> str:
-    """Normalize a column name for mapping."""
-    col = normalize_text(col)
-    col = col.replace(" ", "_").replace("-", "_")
-    col = re.sub(r"[^a-z0-9_]", "", col)
-    return col
+    """Normalize a column name for mapping (memoized: headers repeat across imports)."""
+    col = normalize_text(col).translate(_COLUMN_SEPARATORS)
+    return _NON_COLUMN_CHARS_RE.sub("", col)
@@ -1,6 +1,11 @@
 """Data validation for imports."""
 
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class ValidationResult:
@@ -38,6 +43,8 @@ def validate_product_dataframe(df: pd.DataFrame) -> ValidationResult:
         result.add_warning(f"{dupes} codigos duplicados encontrados (serão ignorados)")
 
     if "thickness_mm" in df.columns:
+        import pandas as pd
+
         non_numeric = pd.to_numeric(df["thickness_mm"], errors="coerce").isna() & df["thickness_mm"].notna()
         if non_numeric.sum() > 0:
             result.add_warning(f"{non_numeric.sum()} valores de espessura nao numericos")
@@ -0,0 +1,89 @@
+"""Tests for the spreadsheet importers."""
+
+import io
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.database import connection
+from src.database.import_data import import_stock
+from src.database.schema import initialize_database
+
+
+class ImportStockTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        patcher = mock.patch.object(
+            connection, "DB_PATH", Path(self.tmpdir) / "test.db"
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        connection.close_connection()
+        initialize_database()
+        self.conn = connection.get_connection()
+        self.conn.executemany(
+            """INSERT INTO products (id, brand, product_name, product_code, thickness_mm)
+               VALUES (?, ?, ?, ?, ?)""",
+            [
+                (1, "DURATEX", "CARVALHO HANOVER", "D1", 18),
+                (2, "EUCATEX", "BRANCO", "E1", 18),
+            ],
+        )
+        self.conn.commit()
+
+    def tearDown(self):
+        connection.close_connection()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _import(self, text):
+        return import_stock(io.BytesIO(text.encode("utf-8")), "estoque.csv")
+
+    def _stock(self):
+        return {
+            row["product_id"]: row["quantity_available"]
+            for row in self.conn.execute("SELECT * FROM stock")
+        }
+
+    def test_rows_sharing_an_unresolved_code_are_kept_per_product(self):
+        result = self._import(
+            "codigo,marca,produto,saldo\n"
+            "SEMCOD,DURATEX,CARVALHO HANOVER,7\n"
+            "SEMCOD,EUCATEX,BRANCO,8\n"
+        )
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.rows_imported, 2)
+        self.assertEqual(self._stock(), {1: 7, 2: 8})
+
+    def test_repeated_product_and_location_keeps_last_row(self):
+        result = self._import(
+            "codigo,marca,produto,saldo\n"
+            "D1,DURATEX,CARVALHO HANOVER,7\n"
+            "D1,DURATEX,CARVALHO HANOVER,9\n"
+        )
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.rows_imported, 1)
+        self.assertEqual(self._stock(), {1: 9})
+        self.assertTrue(any("duplicadas" in w for w in result.warnings))
+
+    def test_name_fallback_ignores_thickness_on_partial_match(self):
+        self.conn.execute(
+            """INSERT INTO products (id, brand, product_name, product_code, thickness_mm)
+               VALUES (3, 'ARAUCO', 'LOURO FREIJO', 'A1', 15)"""
+        )
+        self.conn.commit()
+
+        result = self._import(
+            "codigo,marca,produto,saldo\n"
+            "X4,arauco,MDF LOURO FREIJO 18MM,5\n"
+        )
+
+        self.assertTrue(result.success)
+        self.assertEqual(self._stock(), {3: 5})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Tests for the stock (product_id, location) uniqueness migration."""
+
+import sqlite3
+import unittest
+
+from src.database.schema import TABLES, _ensure_unique_stock_location
+
+
+class EnsureUniqueStockLocationTest(unittest.TestCase):
+    def setUp(self):
+        # An "old" database: tables exist, but stock has no unique index yet
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.row_factory = sqlite3.Row
+        for table_sql in TABLES:
+            self.conn.execute(table_sql)
+        self.conn.executemany(
+            "INSERT INTO products (id, brand, product_name, product_code) VALUES (?, ?, ?, ?)",
+            [(1, "DURATEX", "CARVALHO", "D1"), (2, "ARAUCO", "NOGAL", "A1")],
+        )
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _insert_stock(self, product_id, location, quantity, last_updated):
+        self.conn.execute(
+            """INSERT INTO stock (product_id, location, quantity_available, last_updated)
+               VALUES (?, ?, ?, ?)""",
+            (product_id, location, quantity, last_updated),
+        )
+
+    def _stock(self):
+        return {
+            (row["product_id"], row["location"]): row["quantity_available"]
+            for row in self.conn.execute("SELECT * FROM stock")
+        }
+
+    def test_keeps_most_recently_updated_row_per_pair(self):
+        self._insert_stock(1, "principal", 10, "2024-01-02 10:00:00")
+        self._insert_stock(1, "principal", 30, "2024-03-01 10:00:00")
+        self._insert_stock(1, "principal", 20, "2024-02-01 10:00:00")
+        self._insert_stock(1, "loja2", 5, "2024-01-01 10:00:00")
+        self._insert_stock(2, None, 7, "2024-05-01 10:00:00")
+        self._insert_stock(2, None, 8, "2024-04-01 10:00:00")
+
+        _ensure_unique_stock_location(self.conn)
+
+        self.assertEqual(
+            self._stock(),
+            {(1, "principal"): 30, (1, "loja2"): 5, (2, None): 7},
+        )
+        count = self.conn.execute("SELECT COUNT(*) FROM stock").fetchone()[0]
+        self.assertEqual(count, 3)
+
+    def test_same_timestamp_keeps_latest_inserted_row(self):
+        self._insert_stock(1, "principal", 10, "2024-01-01 10:00:00")
+        self._insert_stock(1, "principal", 11, "2024-01-01 10:00:00")
+
+        _ensure_unique_stock_location(self.conn)
+
+        self.assertEqual(self._stock(), {(1, "principal"): 11})
+
+    def test_creates_unique_index(self):
+        self._insert_stock(1, "principal", 10, "2024-01-01 10:00:00")
+
+        _ensure_unique_stock_location(self.conn)
+
+        index = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'ux_stock_product_location'"
+        ).fetchone()
+        self.assertIsNotNone(index)
+        self.assertIn("UNIQUE", index["sql"].upper())
+        with self.assertRaises(sqlite3.IntegrityError):
+            self._insert_stock(1, "principal", 99, "2024-06-01 10:00:00")
+
+    def test_second_run_leaves_data_alone(self):
+        self._insert_stock(1, "principal", 10, "2024-01-01 10:00:00")
+        _ensure_unique_stock_location(self.conn)
+        self._insert_stock(1, "loja2", 4, "2024-02-01 10:00:00")
+
+        _ensure_unique_stock_location(self.conn)
+
+        self.assertEqual(self._stock(), {(1, "principal"): 10, (1, "loja2"): 4})
+
+
+if __name__ == "__main__":
+    unittest.main()